@@ -2,22 +2,26 @@
 
 from __future__ import annotations
 
-from asyncio import sleep
-from copy import copy
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 import voluptuous as vol
+from aioecopanel import EcoPanelError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (ATTR_ENTITY_ID, CONF_ENABLED, CONF_HOST,
-                                 CONF_NAME, CONF_PORT)
+from homeassistant.const import CONF_ENABLED, CONF_HOST, CONF_NAME, CONF_PORT
 from homeassistant.core import (HomeAssistant, ServiceCall, ServiceResponse,
-                                SupportsResponse)
+                                SupportsResponse, callback)
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntry, async_get
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.helpers.storage import Store
 from homeassistant.util.json import JsonObjectType
 
 from .const import (ATTR_INDEX, ATTR_PRIORITY, ATTR_PROPERTY, ATTR_VALUE,
-                    CONST_COMPARE_SIZE, DOMAIN, LOGGER, WRITE_PROPERTY_SCHEMA,
+                    DOMAIN, LOGGER, STORAGE_VERSION, WRITE_PROPERTY_SCHEMA,
                     WRITE_PROPERTY_SERVICE_NAME, WRITE_RELEASE_SCHEMA,
                     WRITE_RELEASE_SERVICE_NAME)
 from .coordinator import EcoPanelDataUpdateCoordinator
@@ -32,6 +36,9 @@ PLATFORMS: list[str] = [
 	"select",
 ]
 
+# Platforms of entities that are written to when targeting devices or areas
+WRITABLE_PLATFORMS: set[str] = {"number", "select", "switch"}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 	"""Set up EcoPanel BACnet/IP interface from a config entry."""
@@ -43,7 +50,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 	coordinator = EcoPanelDataUpdateCoordinator(hass, entry=entry)
 
-	await coordinator.async_config_entry_first_refresh()
+	if await coordinator.async_load_snapshot():
+		# Entities are set up from the stored devices, live data follows in the background.
+		entry.async_create_background_task(
+			hass, async_first_refresh(coordinator), "bacnet-first-refresh"
+		)
+	else:
+		await coordinator.async_config_entry_first_refresh()
 
 	hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
@@ -54,61 +67,97 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 	# Reload entry when its updated.
 	entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
-	entry.async_create_background_task(
-		hass, async_monitor_data_size(hass, entry, coordinator), "bacnet-monitor-data"
-	)
-
-	async def write_release(call: ServiceCall) -> ServiceResponse:
-		"""Write empty presentValue that serves to release higher priority write request."""
+	@callback
+	def async_get_targets(call: ServiceCall) -> dict[str, tuple[str, str] | None]:
+		"""Get (deviceid, objectid) of the targeted entities, None if it isn't a BACnet object."""
 
 		entity_registry = er.async_get(hass)
+		selected = async_extract_referenced_entity_ids(hass, call)
+		targets: dict[str, tuple[str, str] | None] = {}
 
-		entity_data = entity_registry.async_get(call.data[ATTR_ENTITY_ID][0])
+		for entity_id in sorted(selected.referenced | selected.indirectly_referenced):
+			entity_data = entity_registry.async_get(entity_id)
 
-		device_id, object_id = entity_data.unique_id.split("_")
+			if entity_data is None or entity_data.config_entry_id != entry.entry_id:
+				# Devices and areas can contain entities of other integrations
+				if entity_id in selected.referenced:
+					targets[entity_id] = None
+				continue
 
-		if call.data.get(ATTR_PRIORITY):
-			LOGGER.warning(
-				"Priority is currently not functioning. Writing default value."
+			if (
+				entity_id not in selected.referenced
+				and entity_data.domain not in WRITABLE_PLATFORMS
+			):
+				continue
+
+			# Entities of the integration itself, like its health sensors, aren't objects
+			device_id, _, object_id = entity_data.unique_id.partition("_")
+			if not object_id or device_id not in coordinator.data.devices:
+				targets[entity_id] = None
+				continue
+
+			targets[entity_id] = (device_id, object_id)
+
+		return targets
+
+	async def async_write_targets(
+		call: ServiceCall, write: Callable[[str, str], Awaitable[None]]
+	) -> ServiceResponse:
+		"""Write to all targeted objects at once, the coordinator limits how many are in flight."""
+
+		start = time.monotonic()
+		targets = async_get_targets(call)
+
+		async def async_write_target(target: tuple[str, str] | None) -> dict[str, Any]:
+			if target is None:
+				return {"success": False, "error": "Not a BACnet object"}
+			try:
+				await write(*target)
+			except EcoPanelError as err:
+				return {"success": False, "error": str(err)}
+			return {"success": True}
+
+		results = dict(
+			zip(
+				targets,
+				await asyncio.gather(*map(async_write_target, targets.values())),
 			)
-
-		await coordinator.interface.write_property(
-			deviceid=device_id, objectid=object_id
 		)
+		failed = sum(not result["success"] for result in results.values())
 
-		return {"status": "successfull!"}
+		if failed:
+			LOGGER.warning(f"{failed} of {len(results)} writes failed")
 
-	async def write_property(call: ServiceCall) -> ServiceResponse:
-		"""Write property with value to an object."""
-
-		entity_registry = er.async_get(hass)
-
-		entity_data = entity_registry.async_get(call.data[ATTR_ENTITY_ID][0])
-
-		device_id, object_id = entity_data.unique_id.split("_")
+		return {
+			"status": "failed" if failed else "successfull!",
+			"elapsed": round(time.monotonic() - start, 3),
+			"results": results,
+		}
 
-		if priority := call.data.get(ATTR_PRIORITY):
-			pass
+	async def write_release(call: ServiceCall) -> ServiceResponse:
+		"""Write empty presentValue that serves to release higher priority write request."""
 
-		if property_id := call.data.get(ATTR_PROPERTY):
-			pass
+		if call.data.get(ATTR_PRIORITY):
+			LOGGER.warning(
+				"Priority is currently not functioning. Writing default value."
+			)
 
-		if value := call.data.get(ATTR_VALUE):
-			pass
+		return await async_write_targets(call, coordinator.async_write_release)
 
-		if array_index := call.data.get(ATTR_INDEX):
-			pass
+	async def write_property(call: ServiceCall) -> ServiceResponse:
+		"""Write property with value to an object."""
 
-		await coordinator.interface.write_property_v2(
-			deviceid=device_id,
-			objectid=object_id,
-			propertyid=property_id,
-			value=value,
-			array_index=array_index,
-			priority=priority,
-		)
+		async def async_write(device_id: str, object_id: str) -> None:
+			await coordinator.async_write_property(
+				deviceid=device_id,
+				objectid=object_id,
+				propertyid=call.data.get(ATTR_PROPERTY),
+				value=call.data.get(ATTR_VALUE),
+				array_index=call.data.get(ATTR_INDEX),
+				priority=call.data.get(ATTR_PRIORITY),
+			)
 
-		return {"status": "successfull!"}
+		return await async_write_targets(call, async_write)
 
 	hass.services.async_register(
 		DOMAIN,
@@ -128,6 +177,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 	return True
 
 
+async def async_first_refresh(coordinator: EcoPanelDataUpdateCoordinator) -> None:
+	"""Refresh the stored devices, their entities stay unavailable until it succeeds."""
+
+	await coordinator.async_refresh()
+
+	# The coordinator only logs failures after a successful update
+	if not coordinator.last_update_success:
+		LOGGER.warning(
+			f"Unable to reach the add-on, entities stay unavailable until it answers: {coordinator.last_exception}"
+		)
+
+
 def validate_entry(entry: ConfigEntry) -> ConfigEntry:
 	"""Check if all values are filled in, otherwise replace"""
 
@@ -157,12 +218,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 		await coordinator.interface.disconnect()
 		if coordinator.unsub:
 			coordinator.unsub()
+			coordinator.unsub = None
 
 		del hass.data[DOMAIN][entry.entry_id]
 
 	return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+	"""Remove the stored devices of a removed config entry."""
+	await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
 async def async_remove_config_entry_device(
 	hass: HomeAssistant, config_entry: ConfigEntry, device_entry: DeviceEntry
 ) -> bool:
@@ -187,31 +254,3 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 	"""Reload the config entry when it changed."""
 	await hass.config_entries.async_reload(entry.entry_id)
 
-
-async def async_monitor_data_size(
-	hass: HomeAssistant, entry: ConfigEntry, coordinator: EcoPanelDataUpdateCoordinator
-) -> None:
-	"""Monitor data size, and reload if it increases."""
-
-	old_devices = copy(coordinator.data.devices)
-	old_devices_dict = {}
-
-	for device in old_devices:
-		objects = {device: copy(coordinator.data.devices[device].objects)}
-		old_devices_dict.update(objects)
-
-	while True:
-		await sleep(CONST_COMPARE_SIZE)
-
-		if len(coordinator.data.devices) > len(old_devices):
-			LOGGER.debug(f"Reloading after new device detected!")
-
-			await hass.config_entries.async_schedule_reload(entry.entry_id)
-
-		for device in coordinator.data.devices:
-			if len(coordinator.data.devices[device].objects) > len(
-				old_devices_dict[device]
-			):
-				LOGGER.debug(f"Increased object size")
-
-				await hass.config_entries.async_schedule_reload(entry.entry_id)
\ No newline at end of file
@@ -5,16 +5,15 @@ from typing import Any
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass, BinarySensorEntity, BinarySensorEntityDescription)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ENABLED, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.dt import utcnow
 
 from .const import DOMAIN, LOGGER
 from .coordinator import EcoPanelDataUpdateCoordinator
+from .entity import EcoPanelEntity
 
 
 async def async_setup_entry(
@@ -22,145 +21,51 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up EcoPanel sensor based on a config entry."""
+    """Set up EcoPanel binary sensor based on a config entry."""
     coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entity_list: list = []
 
-    # Collect from all devices the objects that can become a binary sensor
-    for deviceid in coordinator.data.devices:
-        if not coordinator.data.devices[deviceid].objects:
-            LOGGER.warning(f"No objects in {deviceid}!")
-            continue
+    @callback
+    def async_add_objects(objects: list[tuple[str, str]]) -> None:
+        """Add entities for objects of the types that can become a binary sensor."""
+        entity_list: list = []
 
-        for objectid in coordinator.data.devices[deviceid].objects:
-            if (
-                not coordinator.data.devices[deviceid]
+        for deviceid, objectid in objects:
+            if not (
+                object_identifier := coordinator.data.devices[deviceid]
                 .objects[objectid]
                 .objectIdentifier
             ):
                 LOGGER.warning(f"No object identifier for {objectid} in {deviceid}!")
                 continue
-            if (
-                coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
-                == "binaryInput"
-            ):
+
+            if object_identifier[0] == "binaryInput":
                 entity_list.append(
                     BinaryInputEntity(
                         coordinator=coordinator, deviceid=deviceid, objectid=objectid
                     )
                 )
-    async_add_entities(entity_list)
-
-
-class BinaryInputEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], BinarySensorEntity
-):
-    _attr_has_entity_name = True
 
-    def __init__(
-        self,
-        coordinator: EcoPanelDataUpdateCoordinator,
-        deviceid: str,
-        objectid: str,
-    ):
-        """Initialize a BACnet Binary Input object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        if entity_list:
+            async_add_entities(entity_list)
 
-    @property
-    def unique_id(self) -> str:
-        return f"{self.deviceid}_{self.objectid}"
+    # Entities are created for the current objects, and for objects added later on
+    entry.async_on_unload(
+        coordinator.async_add_object_listener(("binaryInput",), async_add_objects)
+    )
 
-    @property
-    def name(self) -> str:
-        name = self.coordinator.config_entry.data.get(CONF_NAME, "object_name")
-        if name == "description":
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].description}"
-        elif name == "object_identifier":
-            identifier = (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .objectIdentifier
-            )
-            return f"{identifier[0]}:{identifier[1]}"
-        else:
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].objectName}"
 
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return if the entity should be enabled when first added to the entity registry."""
-        return self.coordinator.config_entry.data.get(CONF_ENABLED, False)
+class BinaryInputEntity(EcoPanelEntity, BinarySensorEntity):
+    _attr_icon = "mdi:lightbulb-outline"
 
     @property
     def is_on(self) -> bool:
-        if (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-            == "active"
-        ):
+        pres_val = self.bacnet_object.presentValue
+
+        if pres_val == "active":
             return True
-        elif (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-            == True
-        ):
+        elif pres_val == True:
             return True
-        elif (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-            == "inactive"
-        ):
+        elif pres_val == "inactive":
             return False
-        elif (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-            == False
-        ):
+        elif pres_val == False:
             return False
-
-    @property
-    def icon(self):
-        return "mdi:lightbulb-outline"
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
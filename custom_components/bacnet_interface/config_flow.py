@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
+import aiohttp
 import voluptuous as vol
-from aioecopanel import (DeviceDict, EcoPanelConnectionError,
-                         EcoPanelEmptyResponseError, Interface)
+from aioecopanel import EcoPanelConnectionError
 from homeassistant.helpers.service_info.hassio import HassioServiceInfo
 from homeassistant.config_entries import (CONN_CLASS_LOCAL_PUSH, ConfigEntry,
                                           ConfigFlow, ConfigFlowResult,
@@ -18,15 +19,41 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import selector
 from homeassistant.helpers.service_info.hassio import HassioServiceInfo
+from yarl import URL
 
 from .const import CONF_ANALOG_OUTPUT  # pylint:disable=unused-import
-from .const import (CONF_ANALOG_VALUE, CONF_BINARY_OUTPUT, CONF_BINARY_VALUE,
-                    CONF_MULTISTATE_OUTPUT, CONF_MULTISTATE_VALUE, DOMAIN,
-                    LOGGER, NAME_OPTIONS, WRITE_OPTIONS)
+from .const import (CONF_ANALOG_OUTPUT_DEBOUNCE, CONF_ANALOG_VALUE,
+                    CONF_ANALOG_VALUE_DEBOUNCE, CONF_BINARY_OUTPUT,
+                    CONF_BINARY_VALUE, CONF_COALESCE_WINDOW,
+                    CONF_DEVICE_COORDINATORS, CONF_DEVICE_WRITE_LIMIT,
+                    CONF_HEALTH_SENSORS, CONF_MULTISTATE_OUTPUT,
+                    CONF_MULTISTATE_VALUE, CONF_RECORD_TRAFFIC,
+                    CONF_SITE_WRITE_LIMIT, DEFAULT_COALESCE_WINDOW,
+                    DEFAULT_DEVICE_WRITE_LIMIT, DEFAULT_SITE_WRITE_LIMIT,
+                    DEFAULT_WRITE_DEBOUNCE, DOMAIN, LOGGER, NAME_OPTIONS,
+                    PROBE_TIMEOUT, WRITE_OPTIONS)
 
 _LOGGER = LOGGER
 
 
+async def async_probe_addon(hass: HomeAssistant, host: str, port: int) -> None:
+    """Check that the add-on accepts websocket connections, without getting its devices.
+
+    The device tree is only downloaded once, by the coordinator when the entry is set up.
+    """
+    session = async_get_clientsession(hass)
+
+    try:
+        url = URL.build(scheme="ws", host=host, port=port, path="/ws")
+        async with asyncio.timeout(PROBE_TIMEOUT):
+            client = await session.ws_connect(url)
+            await client.close()
+    except (TimeoutError, ValueError, aiohttp.ClientError) as err:
+        raise EcoPanelConnectionError(
+            f"Unable to connect to the add-on at {host}:{port}"
+        ) from err
+
+
 class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for the EcoPanel."""
 
@@ -64,12 +91,6 @@ class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
 
         return await self.async_step_host()
 
-    async def _async_get_device(self, host: str, port: int) -> DeviceDict:
-        """Get device information from add-on."""
-        session = async_get_clientsession(self.hass)
-        interface = Interface(host=host, port=port, session=session)
-        return await interface.update()
-
     async def async_step_host(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -80,13 +101,11 @@ class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
 
             try:
-                devicedict = await self._async_get_device(
-                    host=user_input[CONF_HOST], port=user_input[CONF_PORT]
+                await async_probe_addon(
+                    self.hass, host=user_input[CONF_HOST], port=user_input[CONF_PORT]
                 )
             except EcoPanelConnectionError:
                 errors["base"] = "cannot_connect"
-            except EcoPanelEmptyResponseError:
-                errors["base"] = "empty_response"
             else:
                 self.options.update(user_input)
                 return await self.async_step_naming()
@@ -166,7 +185,7 @@ class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             self.options.update(user_input)
-            return await self._create_options()
+            return await self.async_step_performance()
 
         write_selector = selector(
             {
@@ -178,6 +197,17 @@ class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
                 }
             }
         )
+        debounce_selector = selector(
+            {
+                "number": {
+                    "min": 0,
+                    "max": 5000,
+                    "step": 50,
+                    "unit_of_measurement": "ms",
+                    "mode": "box",
+                }
+            }
+        )
 
         return self.async_show_form(
             step_id="writing",
@@ -231,6 +261,97 @@ class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
                             )
                         },
                     ): write_selector,
+                    vol.Required(
+                        CONF_ANALOG_OUTPUT_DEBOUNCE,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_ANALOG_OUTPUT_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE
+                            )
+                        },
+                    ): debounce_selector,
+                    vol.Required(
+                        CONF_ANALOG_VALUE_DEBOUNCE,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_ANALOG_VALUE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE
+                            )
+                        },
+                    ): debounce_selector,
+                }
+            ),
+        )
+
+    async def async_step_performance(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Get options for tuning how updates are handled"""
+
+        if user_input is not None:
+            self.options.update(user_input)
+            return await self._create_options()
+
+        return self.async_show_form(
+            step_id="performance",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_COALESCE_WINDOW,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                            )
+                        },
+                    ): selector(
+                        {
+                            "number": {
+                                "min": 0,
+                                "max": 1000,
+                                "step": 10,
+                                "unit_of_measurement": "ms",
+                                "mode": "box",
+                            }
+                        }
+                    ),
+                    vol.Required(
+                        CONF_DEVICE_COORDINATORS,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_DEVICE_COORDINATORS, False
+                            )
+                        },
+                    ): bool,
+                    vol.Required(
+                        CONF_DEVICE_WRITE_LIMIT,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_DEVICE_WRITE_LIMIT, DEFAULT_DEVICE_WRITE_LIMIT
+                            )
+                        },
+                    ): selector(
+                        {"number": {"min": 1, "max": 16, "step": 1, "mode": "box"}}
+                    ),
+                    vol.Required(
+                        CONF_SITE_WRITE_LIMIT,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_SITE_WRITE_LIMIT, DEFAULT_SITE_WRITE_LIMIT
+                            )
+                        },
+                    ): selector(
+                        {"number": {"min": 1, "max": 64, "step": 1, "mode": "box"}}
+                    ),
+                    vol.Required(
+                        CONF_HEALTH_SENSORS,
+                        description={
+                            "suggested_value": self.options.get(CONF_HEALTH_SENSORS, False)
+                        },
+                    ): bool,
+                    vol.Required(
+                        CONF_RECORD_TRAFFIC,
+                        description={
+                            "suggested_value": self.options.get(CONF_RECORD_TRAFFIC, False)
+                        },
+                    ): bool,
                 }
             ),
         )
@@ -258,12 +379,6 @@ class OptionsFlowHandler(OptionsFlow):
 
         return await self.async_step_host()
 
-    async def _async_get_device(self, host: str, port: int) -> DeviceDict:
-        """Get device information from add-on."""
-        session = async_get_clientsession(self.hass)
-        interface = Interface(host=host, port=port, session=session)
-        return await interface.update()
-
     async def async_step_host(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -274,13 +389,11 @@ class OptionsFlowHandler(OptionsFlow):
         if user_input is not None:
 
             try:
-                devicedict = await self._async_get_device(
-                    host=user_input[CONF_HOST], port=user_input[CONF_PORT]
+                await async_probe_addon(
+                    self.hass, host=user_input[CONF_HOST], port=user_input[CONF_PORT]
                 )
             except EcoPanelConnectionError:
                 errors["base"] = "cannot_connect"
-            except EcoPanelEmptyResponseError:
-                errors["base"] = "empty_response"
             else:
                 self.options.update(user_input)
                 return await self.async_step_naming()
@@ -364,7 +477,7 @@ class OptionsFlowHandler(OptionsFlow):
 
         if user_input is not None:
             self.options.update(user_input)
-            return await self._update_options()
+            return await self.async_step_performance()
 
         write_selector = selector(
             {
@@ -376,6 +489,17 @@ class OptionsFlowHandler(OptionsFlow):
                 }
             }
         )
+        debounce_selector = selector(
+            {
+                "number": {
+                    "min": 0,
+                    "max": 5000,
+                    "step": 50,
+                    "unit_of_measurement": "ms",
+                    "mode": "box",
+                }
+            }
+        )
 
         return self.async_show_form(
             step_id="writing",
@@ -429,6 +553,97 @@ class OptionsFlowHandler(OptionsFlow):
                             )
                         },
                     ): write_selector,
+                    vol.Required(
+                        CONF_ANALOG_OUTPUT_DEBOUNCE,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_ANALOG_OUTPUT_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE
+                            )
+                        },
+                    ): debounce_selector,
+                    vol.Required(
+                        CONF_ANALOG_VALUE_DEBOUNCE,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_ANALOG_VALUE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE
+                            )
+                        },
+                    ): debounce_selector,
+                }
+            ),
+        )
+
+    async def async_step_performance(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Get options for tuning how updates are handled"""
+
+        if user_input is not None:
+            self.options.update(user_input)
+            return await self._update_options()
+
+        return self.async_show_form(
+            step_id="performance",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_COALESCE_WINDOW,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                            )
+                        },
+                    ): selector(
+                        {
+                            "number": {
+                                "min": 0,
+                                "max": 1000,
+                                "step": 10,
+                                "unit_of_measurement": "ms",
+                                "mode": "box",
+                            }
+                        }
+                    ),
+                    vol.Required(
+                        CONF_DEVICE_COORDINATORS,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_DEVICE_COORDINATORS, False
+                            )
+                        },
+                    ): bool,
+                    vol.Required(
+                        CONF_DEVICE_WRITE_LIMIT,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_DEVICE_WRITE_LIMIT, DEFAULT_DEVICE_WRITE_LIMIT
+                            )
+                        },
+                    ): selector(
+                        {"number": {"min": 1, "max": 16, "step": 1, "mode": "box"}}
+                    ),
+                    vol.Required(
+                        CONF_SITE_WRITE_LIMIT,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_SITE_WRITE_LIMIT, DEFAULT_SITE_WRITE_LIMIT
+                            )
+                        },
+                    ): selector(
+                        {"number": {"min": 1, "max": 64, "step": 1, "mode": "box"}}
+                    ),
+                    vol.Required(
+                        CONF_HEALTH_SENSORS,
+                        description={
+                            "suggested_value": self.config_entry.data.get(CONF_HEALTH_SENSORS, False)
+                        },
+                    ): bool,
+                    vol.Required(
+                        CONF_RECORD_TRAFFIC,
+                        description={
+                            "suggested_value": self.config_entry.data.get(CONF_RECORD_TRAFFIC, False)
+                        },
+                    ): bool,
                 }
             ),
         )
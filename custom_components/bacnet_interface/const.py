@@ -4,7 +4,6 @@ import logging
 from datetime import timedelta
 
 import voluptuous as vol
-from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.helpers import config_validation as cv
 
 # This is the internal name of the integration, it should also match the directory
@@ -14,6 +13,17 @@ DOMAIN = "bacnet_interface"
 LOGGER = logging.getLogger(__package__)
 SCAN_INTERVAL = timedelta(seconds=60)
 
+# Polling backs off to this interval while the websocket pushes data
+HEALTHY_SCAN_INTERVAL = timedelta(minutes=10)
+# The whole device tree, metadata included, is fetched again after this long
+METADATA_REFRESH_INTERVAL = timedelta(hours=1)
+# The websocket is considered stale when it hasn't pushed data for this long
+PUSH_STALE_AFTER = timedelta(minutes=5)
+
+# Delay before reconnecting the websocket, doubled on every failed attempt
+RECONNECT_MIN_DELAY = 0.5  # seconds
+RECONNECT_MAX_DELAY = 30  # seconds
+
 STATETEXT_OFFSET = 1  # JCO
 
 NAME_OPTIONS = ["object_name", "description", "object_identifier"]
@@ -22,9 +32,8 @@ WRITE_OPTIONS = ["presentValue", "relinquishDefault"]
 
 WRITE_RELEASE_SERVICE_NAME = "write_release"
 ATTR_PRIORITY = "priority"
-WRITE_RELEASE_SCHEMA = vol.Schema(
+WRITE_RELEASE_SCHEMA = cv.make_entity_service_schema(
     {
-        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
         vol.Optional(ATTR_PRIORITY): int,
     }
 )
@@ -33,9 +42,8 @@ WRITE_PROPERTY_SERVICE_NAME = "write_property"
 ATTR_PROPERTY = "property"
 ATTR_VALUE = "value"
 ATTR_INDEX = "array_index"
-WRITE_PROPERTY_SCHEMA = vol.Schema(
+WRITE_PROPERTY_SCHEMA = cv.make_entity_service_schema(
     {
-        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
         vol.Optional(ATTR_PROPERTY): str,
         vol.Optional(ATTR_VALUE): str,
         vol.Optional(ATTR_INDEX): int,
@@ -50,4 +58,31 @@ CONF_BINARY_VALUE = "binary_value"
 CONF_MULTISTATE_OUTPUT = "multistate_output"
 CONF_MULTISTATE_VALUE = "multistate_value"
 
-CONST_COMPARE_SIZE = 60
\ No newline at end of file
+CONF_ANALOG_OUTPUT_DEBOUNCE = "analog_output_debounce"
+CONF_ANALOG_VALUE_DEBOUNCE = "analog_value_debounce"
+DEFAULT_WRITE_DEBOUNCE = 0  # milliseconds
+
+# A written value is rolled back when the object hasn't reported it back by then
+WRITE_CONFIRM_TIMEOUT = timedelta(seconds=30)
+
+CONF_COALESCE_WINDOW = "coalesce_window"
+DEFAULT_COALESCE_WINDOW = 100  # milliseconds
+CONF_DEVICE_COORDINATORS = "device_coordinators"
+CONF_DEVICE_WRITE_LIMIT = "device_write_limit"
+DEFAULT_DEVICE_WRITE_LIMIT = 2
+CONF_SITE_WRITE_LIMIT = "site_write_limit"
+DEFAULT_SITE_WRITE_LIMIT = 10
+CONF_HEALTH_SENSORS = "health_sensors"
+CONF_RECORD_TRAFFIC = "record_traffic"
+
+# Integration health sensors show figures of the last minute, refreshed this often
+HEALTH_SCAN_INTERVAL = timedelta(seconds=30)
+
+# Reliability of a device object when the add-on can't reach the device
+UNREACHABLE_RELIABILITY = "communicationFailure"
+
+# Seconds the config flow waits for the add-on's websocket to accept a connection
+PROBE_TIMEOUT = 5
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30  # seconds
@@ -3,18 +3,41 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
+import random
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
 
-from aioecopanel import (DeviceDict, DeviceDictError, EcoPanelConnectionClosed,
-                         EcoPanelError, Interface)
+from aioecopanel import (Device, DeviceDict, DeviceDictError,
+                         EcoPanelConnectionClosed, EcoPanelError, Interface,
+                         Object)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import (async_call_later,
+                                         async_track_time_interval)
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (DataUpdateCoordinator,
                                                       UpdateFailed)
 
-from .const import DOMAIN, LOGGER, SCAN_INTERVAL
+from .const import (CONF_COALESCE_WINDOW, CONF_DEVICE_COORDINATORS,
+                    CONF_DEVICE_WRITE_LIMIT, CONF_RECORD_TRAFFIC,
+                    CONF_SITE_WRITE_LIMIT,
+                    DEFAULT_COALESCE_WINDOW, DEFAULT_DEVICE_WRITE_LIMIT,
+                    DEFAULT_SITE_WRITE_LIMIT, DOMAIN, HEALTHY_SCAN_INTERVAL,
+                    LOGGER, METADATA_REFRESH_INTERVAL, PUSH_STALE_AFTER,
+                    RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY, SCAN_INTERVAL,
+                    SNAPSHOT_SAVE_DELAY, STORAGE_VERSION,
+                    UNREACHABLE_RELIABILITY, WRITE_CONFIRM_TIMEOUT)
+from .helper import (devicedict_to_dict, metadata_revision,
+                     written_value_matches)
+from .stats import LatencyHistogram, RollingWindow
+from .traffic_recorder import TrafficRecorder
+from .write_queue import WriteQueue
 
 
 class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
@@ -36,6 +59,96 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
         )
         self.unsub: CALLBACK_TYPE | None = None
 
+        # Devices as they were when listeners were last updated, used to find changes
+        self._dispatched_devices: dict[str, Device] = {}
+        self._dispatched_success: bool | None = None
+
+        # Update callbacks of entities, indexed by (deviceid, objectid)
+        self._subscribers: dict[tuple[str, str], list[CALLBACK_TYPE]] = {}
+
+        # (deviceid, objectid) pairs by object type, kept up to date by the diff
+        self.object_type_index: dict[str, dict[tuple[str, str], None]] = {}
+
+        # Callbacks of entity platforms that create entities for new objects, by object type
+        self._object_listeners: dict[
+            str, list[Callable[[list[tuple[str, str]]], None]]
+        ] = {}
+
+        # Websocket data is coalesced for this many seconds before it's dispatched
+        self.coalesce_window: float = (
+            entry.data.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW) / 1000
+        )
+        self._coalesced_data: DeviceDict | None = None
+        self._unsub_coalesce: CALLBACK_TYPE | None = None
+
+        # Last known device tree, so entities can be set up before the add-on answers
+        self.snapshot_store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+
+        # Metadata revision of every stored device, the snapshot is only saved
+        # again when a fetched tree doesn't match these.
+        self.metadata_revisions: dict[str, str] = {}
+        self.metadata_cache_hits = 0
+        self.metadata_cache_misses = 0
+
+        # Polling backs off while the websocket pushes data, see _async_adapt_interval
+        self.target_update_interval: timedelta = SCAN_INTERVAL
+        self.last_push: float | None = None
+        self.reconnects = 0
+        self._unsub_stale_check: CALLBACK_TYPE | None = None
+
+        # Monotonic time of the last fetch of the whole tree, see _async_update_data
+        self._tree_fetched_at: float | None = None
+        # Metadata is refreshed on its own timer, websocket pushes postpone polls
+        self._unsub_metadata_refresh = async_track_time_interval(
+            hass,
+            self._async_refresh_metadata,
+            METADATA_REFRESH_INTERVAL,
+            name=f"{DOMAIN} metadata refresh",
+            cancel_on_shutdown=True,
+        )
+
+        # Writes go through a FIFO per object, with limits per device and for the site
+        self.write_queue = WriteQueue(
+            hass,
+            self.interface,
+            device_limit=int(
+                entry.data.get(CONF_DEVICE_WRITE_LIMIT, DEFAULT_DEVICE_WRITE_LIMIT)
+            ),
+            site_limit=int(
+                entry.data.get(CONF_SITE_WRITE_LIMIT, DEFAULT_SITE_WRITE_LIMIT)
+            ),
+        )
+
+        # Latency of writes by deviceid, until the add-on answered and until the
+        # written value came back in an update
+        self.write_latency: dict[str, LatencyHistogram] = {}
+        self.confirm_latency: dict[str, LatencyHistogram] = {}
+        self.unconfirmed_writes = 0
+        # Writes waiting for their value to come back, by (deviceid, objectid)
+        self._awaiting_confirm: dict[tuple[str, str], tuple[str, Any, float]] = {}
+
+        # Rolling windows of the work done per websocket message, dispatch and poll
+        self.message_handling = RollingWindow()
+        self.dispatch_changed = RollingWindow()
+        self.dispatch_fanout = RollingWindow()
+        self.dispatch_handling = RollingWindow()
+        self.rest_updates = RollingWindow(span=METADATA_REFRESH_INTERVAL.total_seconds())
+
+        # Websocket messages are written to disk when recording is switched on
+        self.traffic_recorder: TrafficRecorder | None = None
+        if entry.data.get(CONF_RECORD_TRAFFIC, False):
+            self.traffic_recorder = TrafficRecorder(
+                hass,
+                Path(hass.config.path(DOMAIN, f"recording-{entry.entry_id}.jsonl.gz")),
+            )
+
+        # Child coordinators by deviceid, only when availability is tracked per device
+        self.device_coordinators: dict[str, EcoPanelDeviceCoordinator] | None = (
+            {} if entry.data.get(CONF_DEVICE_COORDINATORS, False) else None
+        )
+
         super().__init__(
             hass,
             LOGGER,
@@ -43,6 +156,10 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
             update_interval=SCAN_INTERVAL,
         )
 
+        # A single coordinator listener dispatches updates to all subscribers.
+        # It also keeps the coordinator refreshing while no entities exist yet.
+        self.async_add_listener(self._async_dispatch)
+
     @callback
     def _use_websocket(self) -> None:
         """Use websockets for updating"""
@@ -54,49 +171,70 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
             elif data.devices is None:
                 LOGGER.warning(f"Received data.devices is NoneType!")
             else:
-                self.async_set_updated_data(data)
+                self.last_push = time.monotonic()
+                if self.traffic_recorder:
+                    self.traffic_recorder.async_record(data)
+                self._async_coalesce_data(data)
+                self.message_handling.add(time.monotonic() - self.last_push)
+
+        async def resume() -> None:
+            """Fetch the data that changed while the websocket was disconnected"""
+            devicedict = await self._async_fetch_tree()
+            # Only objects that changed during the gap are dispatched after the diff
+            self.async_set_updated_data(devicedict)
 
         async def listen() -> None:
-            """Listen for state changes through websocket"""
-            try:
-                # Connect to websocket
-                await self.interface.connect()
-            except EcoPanelError as e:
-                self.logger.info(e)
-                # If shutting down... shut down gracefully
-                if self.unsub:
-                    self.unsub()
-                    self.unsub = None
-                    LOGGER.debug(f"Unsub after failing to connect")
-                return
-
-            LOGGER.debug("Connected websocket")
-
-            try:
-                # This will stay running in the background.
-                # It calls DataUpdateCoordinator.async_set_updated_data when a message is received on the websocket.
-                # The data will then be accessable on coordinator.data where coordinator is the variable name of EcoPanelDataUpdateCoordinator.
-                await self.interface.listen(callback=check_data)
-
-            except EcoPanelConnectionClosed as err:
-                self.last_update_success = False
-                self.logger.info(err)
-            except EcoPanelError as err:
-                self.last_update_success = False
-                self.async_update_listeners()
-                self.logger.error(err)
-            except Exception as err:
-                self.last_update_success = False
-                self.async_update_listeners()
-                self.logger.error(err)
-
-            LOGGER.debug("Disconnecting websocket after listening")
-
-            # Make sure we are disconnected
-            await self.interface.disconnect()
-            if self.unsub:
-                self.unsub()
-                self.unsub = None
+            """Listen for state changes through websocket, reconnect when it closes"""
+            attempt = 0
+
+            # unsub is cleared when Home Assistant stops or the entry unloads
+            while self.unsub:
+                try:
+                    # Connect to websocket
+                    await self.interface.connect()
+                    LOGGER.debug("Connected websocket")
+
+                    if attempt:
+                        await resume()
+                        LOGGER.info(f"Reconnected websocket after {attempt} attempts")
+                        self.reconnects += 1
+                        attempt = 0
+
+                    # This will stay running in the background.
+                    # It calls DataUpdateCoordinator.async_set_updated_data when a message is received on the websocket.
+                    # The data will then be accessable on coordinator.data where coordinator is the variable name of EcoPanelDataUpdateCoordinator.
+                    await self.interface.listen(callback=check_data)
+
+                except EcoPanelConnectionClosed as err:
+                    self.logger.info(err)
+                except (EcoPanelError, DeviceDictError) as err:
+                    if attempt:
+                        self.logger.debug(err)
+                    else:
+                        self.logger.error(err)
+                except Exception as err:
+                    self.logger.error(err)
+
+                LOGGER.debug("Disconnecting websocket after listening")
+
+                # Make sure we are disconnected
+                await self.interface.disconnect()
+
+                if not self.unsub:
+                    break
+
+                self._async_adapt_interval()
+
+                # A dropped connection gets one quick retry before entities go unavailable
+                if attempt and self.last_update_success:
+                    self.last_update_success = False
+                    self.async_update_listeners()
+
+                delay = min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2**attempt)
+                attempt += 1
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+
+            LOGGER.debug("Stopped listening to websocket")
 
         async def close_websocket(_: Event) -> None:
             """Close WebSocket connection."""
@@ -104,6 +242,10 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
             self.unsub = None
             await self.interface.disconnect()
 
+            # Entries aren't unloaded when Home Assistant stops
+            if self.traffic_recorder:
+                await self.traffic_recorder.async_close()
+
         LOGGER.debug("Set unsub listener")
 
         # Clean disconnect WebSocket on Home Assistant shutdown
@@ -116,15 +258,611 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
             self.hass, listen(), "bacnet-listen"
         )
 
-    async def _async_update_data(self) -> DeviceDict:
+    @callback
+    def _async_coalesce_data(self, data: DeviceDict) -> None:
+        """Set websocket data once the coalesce window has passed"""
+
+        if not self.coalesce_window:
+            self.async_set_updated_data(data)
+            return
+
+        # aioecopanel merges every message into the same DeviceDict, so the last
+        # value of an object wins and the diff on dispatch covers the whole batch.
+        self._coalesced_data = data
+
+        if self._unsub_coalesce is None:
+            self._unsub_coalesce = async_call_later(
+                self.hass, self.coalesce_window, self._async_flush_coalesced
+            )
+
+    @callback
+    def _async_flush_coalesced(self, _: datetime | None = None) -> None:
+        """Set the coalesced websocket data as coordinator data"""
+
+        self._unsub_coalesce = None
+
+        if (data := self._coalesced_data) is None:
+            return
+
+        self._coalesced_data = None
+        self.async_set_updated_data(data)
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending coalesced updates and shut down the coordinator"""
+
+        if self._unsub_coalesce:
+            self._unsub_coalesce()
+            self._unsub_coalesce = None
+        self._coalesced_data = None
+
+        if self._unsub_stale_check:
+            self._unsub_stale_check()
+            self._unsub_stale_check = None
+
+        self._unsub_metadata_refresh()
+
+        if self.traffic_recorder:
+            await self.traffic_recorder.async_close()
+
+        await super().async_shutdown()
+
+    @callback
+    def async_set_updated_data(self, data: DeviceDict) -> None:
+        """Set pushed data and update listeners.
+
+        DataUpdateCoordinator would postpone the next poll, then a busy
+        websocket keeps the integrity polls and the back off from running.
+        """
+        self.data = data
+        self.last_update_success = True
+
+        if self._unsub_refresh is None and self._listeners:
+            self._schedule_refresh()
+
+        self.async_update_listeners()
+
+    @callback
+    def _async_push_age(self) -> float | None:
+        """Seconds since the websocket last pushed data"""
+        if self.last_push is None:
+            return None
+        return time.monotonic() - self.last_push
+
+    @callback
+    def _async_websocket_healthy(self) -> bool:
+        """Check whether the websocket is connected and recently pushed data"""
+        push_age = self._async_push_age()
+        return (
+            self.interface.connected
+            and push_age is not None
+            and push_age < PUSH_STALE_AFTER.total_seconds()
+        )
+
+    @callback
+    def _async_adapt_interval(self, back_off: bool = False) -> None:
+        """Poll slowly while the websocket pushes data, and quickly when it doesn't.
+
+        The interval is only increased when back_off is set, which polls do.
+        """
+
+        healthy = self._async_websocket_healthy()
+
+        self.target_update_interval = (
+            HEALTHY_SCAN_INTERVAL if healthy else SCAN_INTERVAL
+        )
+
+        if self._unsub_stale_check:
+            self._unsub_stale_check()
+            self._unsub_stale_check = None
+
+        if healthy:
+            # Look at the websocket again once its last push would become stale
+            self._unsub_stale_check = async_call_later(
+                self.hass,
+                PUSH_STALE_AFTER.total_seconds() - self._async_push_age(),
+                self._async_check_stale,
+            )
+
+        if back_off and self.update_interval < self.target_update_interval:
+            # Back off gradually, the interval doubles with every healthy poll
+            self.update_interval = min(
+                self.update_interval * 2, self.target_update_interval
+            )
+        elif self.update_interval > self.target_update_interval:
+            # Tighten at once, and don't wait for the slow poll that's scheduled
+            LOGGER.debug(
+                f"Websocket unhealthy, polling every {self.target_update_interval}"
+            )
+            self.update_interval = self.target_update_interval
+            if self._listeners:
+                self._schedule_refresh()
+
+    @callback
+    def _async_check_stale(self, _: datetime | None = None) -> None:
+        """Tighten the update interval if the websocket stopped pushing"""
+
+        self._unsub_stale_check = None
+        self._async_adapt_interval()
+
+    @callback
+    def async_subscribe(
+        self, deviceid: str, objectid: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for updates of a single BACnet object"""
+
+        key = (deviceid, objectid)
+        self._subscribers.setdefault(key, []).append(update_callback)
+
+        @callback
+        def remove_subscription() -> None:
+            """Remove update callback of the BACnet object."""
+            callbacks = self._subscribers[key]
+            callbacks.remove(update_callback)
+
+            if not callbacks:
+                del self._subscribers[key]
+
+        return remove_subscription
+
+    async def async_write_property(
+        self,
+        deviceid: str,
+        objectid: str,
+        propertyid: str | None,
+        value: Any,
+        array_index: int | None = None,
+        priority: int | None = None,
+    ) -> None:
+        """Write a property of a BACnet object through the write queue"""
+        started = time.monotonic()
+
+        await self.write_queue.async_write(
+            deviceid,
+            objectid,
+            ("property", propertyid, array_index, priority),
+            value,
+        )
+
+        self._async_record_latency(self.write_latency, deviceid, started)
+
+        if propertyid is None or array_index is not None:
+            return
+
+        # The value may have come back before the add-on answered
+        bacnet_object = self._async_get_object(deviceid, objectid)
+        if not hasattr(bacnet_object, propertyid):
+            # aioecopanel doesn't keep every property, relinquishDefault can't come back
+            return
+        if written_value_matches(getattr(bacnet_object, propertyid, None), value):
+            self._async_record_latency(self.confirm_latency, deviceid, started)
+        else:
+            self._awaiting_confirm[(deviceid, objectid)] = (propertyid, value, started)
+
+    async def async_write_release(self, deviceid: str, objectid: str) -> None:
+        """Write an empty presentValue to a BACnet object through the write queue"""
+        started = time.monotonic()
+        await self.write_queue.async_write(deviceid, objectid, ("release",))
+        self._async_record_latency(self.write_latency, deviceid, started)
+
+    @callback
+    def _async_record_latency(
+        self, histograms: dict[str, LatencyHistogram], deviceid: str, started: float
+    ) -> None:
+        """Count the time since started in the histogram of a device"""
+        if (histogram := histograms.get(deviceid)) is None:
+            histogram = histograms[deviceid] = LatencyHistogram()
+        histogram.add(time.monotonic() - started)
+
+    @callback
+    def _async_get_object(self, deviceid: str, objectid: str) -> Object | None:
+        """Return a BACnet object of the data, if it's there"""
+        if device := self.data.devices.get(deviceid):
+            return device.objects.get(objectid)
+        return None
+
+    @callback
+    def _async_confirm_writes(self, changed: set[tuple[str, str]]) -> None:
+        """Time the writes whose value came back in this update"""
+        now = time.monotonic()
+
+        for key in list(self._awaiting_confirm):
+            propertyid, value, started = self._awaiting_confirm[key]
+
+            if now - started > WRITE_CONFIRM_TIMEOUT.total_seconds():
+                del self._awaiting_confirm[key]
+                self.unconfirmed_writes += 1
+                continue
+
+            if key not in changed:
+                continue
+
+            deviceid, objectid = key
+            bacnet_object = self._async_get_object(deviceid, objectid)
+            if written_value_matches(getattr(bacnet_object, propertyid, None), value):
+                del self._awaiting_confirm[key]
+                self._async_record_latency(self.confirm_latency, deviceid, started)
+
+    @callback
+    def async_get_device_coordinator(
+        self, deviceid: str
+    ) -> EcoPanelDataUpdateCoordinator | EcoPanelDeviceCoordinator:
+        """Get the coordinator entities of a BACnet device should listen to"""
+
+        if self.device_coordinators is None:
+            return self
+
+        if (device_coordinator := self.device_coordinators.get(deviceid)) is None:
+            device_coordinator = self.device_coordinators[
+                deviceid
+            ] = EcoPanelDeviceCoordinator(self, deviceid)
+
+        return device_coordinator
+
+    @callback
+    def async_add_object_listener(
+        self,
+        object_types: tuple[str, ...],
+        object_callback: Callable[[list[tuple[str, str]]], None],
+    ) -> CALLBACK_TYPE:
+        """Listen for BACnet objects of some types to create entities for.
+
+        The callback is called with all objects of those types known right away,
+        and after that with the objects that are new in an update.
+        """
+
+        for object_type in object_types:
+            self._object_listeners.setdefault(object_type, []).append(object_callback)
+
+        object_callback(
+            [
+                key
+                for object_type in object_types
+                for key in self.object_type_index.get(object_type, ())
+            ]
+        )
+
+        @callback
+        def remove_object_listener() -> None:
+            """Remove object callback."""
+            for object_type in object_types:
+                self._object_listeners[object_type].remove(object_callback)
+
+        return remove_object_listener
+
+    @callback
+    def _async_dispatch(self) -> None:
+        """Add new BACnet objects and call the subscribers of changed objects"""
+
+        if self.data is None or self.data.devices is None:
+            return
+
+        started = time.monotonic()
+        changed, added = self._async_diff_devices()
+
+        if added:
+            LOGGER.debug(f"Adding {sum(map(len, added.values()))} new objects")
+
+            for object_type, keys in added.items():
+                for object_callback in list(self._object_listeners.get(object_type, ())):
+                    object_callback(keys)
+
+            self.snapshot_store.async_delay_save(
+                self._async_snapshot_data, SNAPSHOT_SAVE_DELAY
+            )
+
+        if self._awaiting_confirm:
+            self._async_confirm_writes(changed)
+
+        availability_changed = self._dispatched_success != self.last_update_success
+        self._dispatched_success = self.last_update_success
+
+        fanout = 0
+        if self.device_coordinators is not None:
+            fanout = self._async_dispatch_devices(changed, availability_changed)
+        elif availability_changed:
+            # Availability changed, every entity has to write its state
+            for callbacks in list(self._subscribers.values()):
+                for update_callback in list(callbacks):
+                    update_callback()
+                    fanout += 1
+        else:
+            LOGGER.debug(f"Dispatching {len(changed)} changed objects")
+
+            for key in changed:
+                for update_callback in self._subscribers.get(key, ()):
+                    update_callback()
+                    fanout += 1
+
+        self.dispatch_changed.add(len(changed))
+        self.dispatch_fanout.add(fanout)
+        self.dispatch_handling.add(time.monotonic() - started)
+
+    @callback
+    def _async_dispatch_devices(
+        self, changed: set[tuple[str, str]], availability_changed: bool
+    ) -> int:
+        """Pass the devices that changed on to their child coordinators.
+
+        Returns the number of entities that were called.
+        """
+
+        changed_by_device: dict[str, list[str]] = {}
+        for deviceid, objectid in changed:
+            changed_by_device.setdefault(deviceid, []).append(objectid)
+
+        LOGGER.debug(
+            f"Dispatching {len(changed)} changed objects of {len(changed_by_device)} devices"
+        )
+
+        fanout = 0
+        for deviceid, device_coordinator in self.device_coordinators.items():
+            device = self._dispatched_devices.get(deviceid)
+
+            # Devices that weren't in the update are left alone
+            if device is device_coordinator.data and not availability_changed:
+                continue
+
+            fanout += device_coordinator.async_set_device(
+                device, self.last_update_success, changed_by_device.get(deviceid, ())
+            )
+
+        return fanout
+
+    @callback
+    def _async_diff_devices(
+        self,
+    ) -> tuple[set[tuple[str, str]], dict[str, list[tuple[str, str]]]]:
+        """Diff the data against the last dispatched data.
+
+        Returns the (deviceid, objectid) pairs that changed, and the pairs of
+        those that are new by object type. The object type index is updated
+        along the way.
+        """
+
+        previous = self._dispatched_devices
+        devices = self._dispatched_devices = dict(self.data.devices)
+
+        changed: set[tuple[str, str]] = set()
+        added: dict[str, list[tuple[str, str]]] = {}
+
+        for deviceid, device in devices.items():
+            # aioecopanel replaces a Device when it receives data for it
+            if (old_device := previous.get(deviceid)) is device:
+                continue
+
+            old_objects = old_device.objects if old_device else {}
+
+            for objectid, bacnet_object in device.objects.items():
+                if (old_object := old_objects.get(objectid)) != bacnet_object:
+                    changed.add((deviceid, objectid))
+
+                    if old_object is None and bacnet_object.objectIdentifier:
+                        object_type = bacnet_object.objectIdentifier[0]
+                        self.object_type_index.setdefault(object_type, {})[
+                            (deviceid, objectid)
+                        ] = None
+                        added.setdefault(object_type, []).append((deviceid, objectid))
+
+            for objectid in old_objects.keys() - device.objects.keys():
+                self._async_unindex_object(deviceid, objectid, old_objects[objectid])
+
+        for deviceid in previous.keys() - devices.keys():
+            for objectid, bacnet_object in previous[deviceid].objects.items():
+                self._async_unindex_object(deviceid, objectid, bacnet_object)
+
+        return changed, added
+
+    @callback
+    def _async_unindex_object(
+        self, deviceid: str, objectid: str, bacnet_object: Object
+    ) -> None:
+        """Remove a BACnet object that's gone from the object type index"""
+        if not bacnet_object.objectIdentifier:
+            return
+
+        if keys := self.object_type_index.get(bacnet_object.objectIdentifier[0]):
+            keys.pop((deviceid, objectid), None)
+
+    async def async_load_snapshot(self) -> bool:
+        """Set the stored device tree as data, returns False if there is none"""
+
+        try:
+            snapshot = await self.snapshot_store.async_load()
+        except HomeAssistantError as err:
+            LOGGER.warning(f"Unable to load stored devices: {err}")
+            return False
+
+        if not snapshot:
+            return False
+
         try:
-            devicedict = await self.interface.update(
-                full_update=not self.last_update_success
+            self.data = DeviceDict(snapshot)
+        except (EcoPanelError, DeviceDictError) as err:
+            LOGGER.warning(f"Stored devices are invalid: {err}")
+            return False
+
+        # Entities are created for the stored objects, later updates are diffed against them
+        self._dispatched_devices = {}
+        self._async_diff_devices()
+
+        # Stored values may be stale, entities are unavailable until the add-on answers
+        self.last_update_success = False
+
+        self.metadata_revisions = {
+            deviceid: metadata_revision(device)
+            for deviceid, device in self.data.devices.items()
+        }
+
+        LOGGER.debug(f"Loaded {len(snapshot)} devices from storage")
+        return True
+
+    @callback
+    def _async_snapshot_data(self) -> dict:
+        """Return the device tree to store"""
+        return devicedict_to_dict(self.data)
+
+    async def _async_fetch_tree(self) -> DeviceDict:
+        """Fetch the whole device tree from the add-on, metadata included"""
+
+        devicedict = await self.interface.update(full_update=True)
+        self._tree_fetched_at = time.monotonic()
+
+        # Every Device was replaced, the recording continues from the whole tree
+        if self.traffic_recorder:
+            self.traffic_recorder.async_record(devicedict, resume=True)
+
+        self._async_check_metadata(devicedict)
+        return devicedict
+
+    @callback
+    def _async_check_metadata(self, devicedict: DeviceDict) -> None:
+        """Compare fetched metadata with the stored devices, save them if it changed"""
+
+        revisions = {
+            deviceid: metadata_revision(device)
+            for deviceid, device in devicedict.devices.items()
+        }
+        hits = sum(
+            self.metadata_revisions.get(deviceid) == revision
+            for deviceid, revision in revisions.items()
+        )
+        self.metadata_cache_hits += hits
+        self.metadata_cache_misses += len(revisions) - hits
+
+        if revisions != self.metadata_revisions:
+            LOGGER.debug(f"Metadata of {len(revisions) - hits} devices changed")
+            self.metadata_revisions = revisions
+            # The data is read when saving, so it includes later websocket updates.
+            self.snapshot_store.async_delay_save(
+                self._async_snapshot_data, SNAPSHOT_SAVE_DELAY
             )
+
+    async def _async_refresh_metadata(self, _: datetime) -> None:
+        """Fetch the whole tree for changed metadata and new objects"""
+
+        started = time.monotonic()
+        try:
+            devicedict = await self._async_fetch_tree()
+        except (EcoPanelError, DeviceDictError) as error:
+            LOGGER.warning(f"Unable to refresh metadata: {error}")
+            return
+        finally:
+            self.rest_updates.add(time.monotonic() - started)
+
+        self.async_set_updated_data(devicedict)
+
+    async def _async_update_data(self) -> DeviceDict:
+        # Values are kept up to date by the websocket and metadata by
+        # _async_refresh_metadata. aioecopanel only makes a request for the
+        # whole tree, so polls fetch it when the websocket is down or stale.
+        full_update = (
+            self._tree_fetched_at is None or not self._async_websocket_healthy()
+        )
+
+        started = time.monotonic()
+        try:
+            if full_update:
+                devicedict = await self._async_fetch_tree()
+            else:
+                devicedict = await self.interface.update()
         except (EcoPanelError, DeviceDictError) as error:
             raise UpdateFailed(f"Invalid response from API: {error}") from error
+        finally:
+            self.rest_updates.add(time.monotonic() - started)
 
         if devicedict is not None and not self.interface.connected and not self.unsub:
             self._use_websocket()
 
+        # The refresh that's scheduled after this update uses the new interval
+        self._async_adapt_interval(back_off=True)
+
         return devicedict
+
+
+class EcoPanelDeviceCoordinator:
+    """Subscribers and availability of a single BACnet device.
+
+    Fed by the EcoPanel coordinator, which does all requests. Entities of the
+    device subscribe here instead of with the EcoPanel coordinator.
+    """
+
+    def __init__(
+        self,
+        parent: EcoPanelDataUpdateCoordinator,
+        deviceid: str,
+    ) -> None:
+        """Initialize the coordinator of a BACnet device"""
+
+        self.deviceid = deviceid
+
+        # Update callbacks of entities, indexed by objectid
+        self._subscribers: dict[str, list[CALLBACK_TYPE]] = {}
+
+        self.data: Device | None = parent.data.devices.get(deviceid)
+        self.last_update_success = parent.last_update_success and (
+            self._device_reachable(self.data)
+        )
+
+    def _device_reachable(self, device: Device | None) -> bool:
+        """Check whether the add-on still has the device and can reach it"""
+
+        if device is None:
+            return False
+
+        if (device_object := device.objects.get(self.deviceid)) is None:
+            return True
+
+        return device_object.reliability != UNREACHABLE_RELIABILITY
+
+    @callback
+    def async_subscribe(
+        self, deviceid: str, objectid: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for updates of a single BACnet object of this device"""
+
+        self._subscribers.setdefault(objectid, []).append(update_callback)
+
+        @callback
+        def remove_subscription() -> None:
+            """Remove update callback of the BACnet object."""
+            callbacks = self._subscribers[objectid]
+            callbacks.remove(update_callback)
+
+            if not callbacks:
+                del self._subscribers[objectid]
+
+        return remove_subscription
+
+    @callback
+    def async_set_device(
+        self, device: Device | None, parent_success: bool, objectids: Iterable[str]
+    ) -> int:
+        """Set new data of the device and call the subscribers of changed objects.
+
+        Returns the number of subscribers that were called.
+        """
+
+        self.data = device
+        available = parent_success and self._device_reachable(device)
+
+        fanout = 0
+        if available != self.last_update_success:
+            # Availability changed, every entity of the device has to write its state
+            self.last_update_success = available
+
+            if available:
+                LOGGER.info(f"Device {self.deviceid} is available again")
+            else:
+                LOGGER.warning(f"Device {self.deviceid} is unavailable")
+
+            for callbacks in list(self._subscribers.values()):
+                for update_callback in list(callbacks):
+                    update_callback()
+                    fanout += 1
+        else:
+            for objectid in objectids:
+                for update_callback in self._subscribers.get(objectid, ()):
+                    update_callback()
+                    fanout += 1
+
+        return fanout
@@ -0,0 +1,102 @@
+"""Diagnostics support for the Bepacom EcoPanel BACnet/IP integration."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+from .coordinator import EcoPanelDataUpdateCoordinator
+from .helper import devicedict_size
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    write_stats = coordinator.write_queue.stats
+    devices = coordinator.data.devices if coordinator.data else {}
+
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "websocket_connected": coordinator.interface.connected,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "target_update_interval": coordinator.target_update_interval.total_seconds(),
+            "seconds_since_last_push": (
+                round(time.monotonic() - coordinator.last_push, 1)
+                if coordinator.last_push is not None
+                else None
+            ),
+            "recorded_messages": (
+                coordinator.traffic_recorder.recorded
+                if coordinator.traffic_recorder
+                else None
+            ),
+        },
+        "throughput": {
+            # Handling times are in seconds, websocket messages are counted by their handling
+            "websocket_messages": coordinator.message_handling.as_dict(digits=6),
+            "dispatch_handling": coordinator.dispatch_handling.as_dict(digits=6),
+            "changed_objects_per_dispatch": coordinator.dispatch_changed.as_dict(),
+            "entity_updates_per_dispatch": coordinator.dispatch_fanout.as_dict(),
+            "rest_updates": coordinator.rest_updates.as_dict(),
+        },
+        "size": {
+            "devices": len(devices),
+            "objects": sum(len(device.objects) for device in devices.values()),
+            "entities": len(
+                er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+            ),
+            "device_dict_bytes": (
+                devicedict_size(coordinator.data) if coordinator.data else None
+            ),
+        },
+        "metadata_cache": {
+            "devices": len(coordinator.metadata_revisions),
+            "hits": coordinator.metadata_cache_hits,
+            "misses": coordinator.metadata_cache_misses,
+        },
+        "write_queue": {
+            "depth": coordinator.write_queue.depth,
+            "max_depth": write_stats.max_depth,
+            "depth_by_device": {
+                deviceid: depth
+                for deviceid, depth in write_stats.depth_by_device.items()
+                if depth
+            },
+            "writes": write_stats.writes,
+            "coalesced": write_stats.coalesced,
+            "failed": write_stats.failed,
+            "average_wait": (
+                round(write_stats.total_wait / write_stats.writes, 3)
+                if write_stats.writes
+                else None
+            ),
+            "max_wait": round(write_stats.max_wait, 3),
+        },
+        "write_latency": {
+            "unconfirmed": coordinator.unconfirmed_writes,
+            "devices": {
+                deviceid: {
+                    "response": histogram.as_dict(),
+                    "confirmation": (
+                        confirm.as_dict()
+                        if (confirm := coordinator.confirm_latency.get(deviceid))
+                        else None
+                    ),
+                }
+                for deviceid, histogram in coordinator.write_latency.items()
+            },
+        },
+    }
@@ -0,0 +1,274 @@
+"""Base entity for the Bepacom EcoPanel BACnet/IP integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from aioecopanel import EcoPanelError, Object
+from homeassistant.const import CONF_ENABLED, CONF_NAME
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import (BaseCoordinatorEntity,
+                                                      CoordinatorEntity)
+
+from .const import DOMAIN, LOGGER, WRITE_CONFIRM_TIMEOUT
+from .coordinator import EcoPanelDataUpdateCoordinator
+from .helper import key_to_property, written_value_matches
+
+
+class EcoPanelEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator]):
+    """Entity representing a single object of a BACnet device."""
+
+    _attr_has_entity_name = True
+
+    # Properties of the BACnet object that static attributes are derived from
+    _metadata_properties: tuple[str, ...] = (
+        "objectIdentifier",
+        "objectName",
+        "description",
+    )
+
+    def __init__(
+        self,
+        coordinator: EcoPanelDataUpdateCoordinator,
+        deviceid: str,
+        objectid: str,
+    ) -> None:
+        """Initialize a BACnet object as entity."""
+        super().__init__(coordinator=coordinator)
+        self.deviceid = deviceid
+        self.objectid = objectid
+        self.device_coordinator = coordinator.async_get_device_coordinator(deviceid)
+
+        self._attr_unique_id = f"{deviceid}_{objectid}"
+        self._attr_entity_registry_enabled_default = (
+            coordinator.config_entry.data.get(CONF_ENABLED, False)
+        )
+
+        device = coordinator.data.devices[deviceid].objects.get(deviceid)
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, deviceid)},
+            name=f"{device.objectName}" if device else deviceid,
+            manufacturer=device.vendorName if device else None,
+            model=device.modelName if device else None,
+        )
+
+        self.bacnet_object: Object = coordinator.data.devices[deviceid].objects[
+            objectid
+        ]
+        self._metadata: tuple | None = None
+        self._async_update_object()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates of this entity's BACnet object."""
+        # Skip BaseCoordinatorEntity, it would register as a listener for every update.
+        await super(BaseCoordinatorEntity, self).async_added_to_hass()
+        self.async_on_remove(
+            self.device_coordinator.async_subscribe(
+                self.deviceid, self.objectid, self._handle_coordinator_update
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if the BACnet device of this entity is available."""
+        return self.device_coordinator.last_update_success
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle an update of the BACnet object."""
+        self._async_update_object()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_update_object(self) -> None:
+        """Resolve the BACnet object, and its static attributes if its metadata changed."""
+        if (device := self.coordinator.data.devices.get(self.deviceid)) and (
+            bacnet_object := device.objects.get(self.objectid)
+        ):
+            self.bacnet_object = bacnet_object
+
+        metadata = tuple(
+            getattr(self.bacnet_object, prop) for prop in self._metadata_properties
+        )
+
+        if metadata != self._metadata:
+            self._metadata = metadata
+            self._async_update_metadata()
+
+    @callback
+    def _async_update_metadata(self) -> None:
+        """Set the attributes that only change with the metadata of the object."""
+        name = self.coordinator.config_entry.data.get(CONF_NAME, "object_name")
+        if name == "description":
+            self._attr_name = f"{self.bacnet_object.description}"
+        elif name == "object_identifier":
+            identifier = self.bacnet_object.objectIdentifier
+            self._attr_name = f"{identifier[0]}:{identifier[1]}"
+        else:
+            self._attr_name = f"{self.bacnet_object.objectName}"
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        status_flags = self.bacnet_object.statusFlags
+        return {
+            "inAlarm": bool(status_flags[0]),
+            "fault": bool(status_flags[1]),
+            "overridden": bool(status_flags[2]),
+            "outOfService": bool(status_flags[3]),
+        }
+
+
+class EcoPanelWritableEntity(EcoPanelEntity):
+    """Entity of a BACnet object that shows written values before they're confirmed.
+
+    A written presentValue is shown right away, and stays until the object
+    reports it back. If that doesn't happen within the timeout, the value is
+    rolled back and the entity is flagged as unconfirmed until it's reported.
+    Writes of other properties, like relinquishDefault, aren't shown.
+    """
+
+    # Config key of the property that's written
+    _conf_write_property: str
+
+    def __init__(
+        self,
+        coordinator: EcoPanelDataUpdateCoordinator,
+        deviceid: str,
+        objectid: str,
+    ) -> None:
+        """Initialize a writable BACnet object as entity."""
+        self._optimistic_value: Any = None
+        self._write_unconfirmed = False
+        # The written value that wasn't reported back in time
+        self._unconfirmed_value: Any = None
+        self._unsub_confirm: CALLBACK_TYPE | None = None
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop waiting for a written value to be confirmed."""
+        self._async_cancel_confirm()
+        await super().async_will_remove_from_hass()
+
+    @property
+    def present_value(self) -> Any:
+        """Return the written value while it's unconfirmed, else the presentValue."""
+        if self._optimistic_value is not None:
+            return self._optimistic_value
+        return self.bacnet_object.presentValue
+
+    @property
+    def write_propertyid(self) -> str | None:
+        """Return the property that's written, as configured for the object type."""
+        return key_to_property(
+            self.coordinator.config_entry.data.get(
+                self._conf_write_property, "present_value"
+            )
+        )
+
+    @property
+    def write_optimistic(self) -> bool:
+        """Return if written values are shown, only the presentValue is reported back."""
+        return self.write_propertyid == "presentValue"
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            **super().extra_state_attributes,
+            "write_unconfirmed": self._write_unconfirmed,
+        }
+
+    @callback
+    def _async_update_object(self) -> None:
+        """Drop the written value once the object reported it back."""
+        super()._async_update_object()
+
+        if self._unsub_confirm is not None and self._async_write_confirmed(
+            self._optimistic_value
+        ):
+            self._async_cancel_confirm()
+            self._optimistic_value = None
+
+        # A value that came back late still confirms the write
+        if self._write_unconfirmed and self._async_write_confirmed(
+            self._unconfirmed_value
+        ):
+            self._write_unconfirmed = False
+            self._unconfirmed_value = None
+
+    @callback
+    def _async_set_optimistic(self, value: Any) -> None:
+        """Show a value until it's written and confirmed."""
+        if not self.write_optimistic:
+            return
+
+        self._async_cancel_confirm()
+        self._optimistic_value = value
+        self._write_unconfirmed = False
+        self._unconfirmed_value = None
+        self.async_write_ha_state()
+
+    async def _async_write_value(self, value: Any) -> None:
+        """Write a value to the object, showing it until it's confirmed."""
+        self._async_set_optimistic(value)
+
+        try:
+            await self.coordinator.async_write_property(
+                deviceid=self.deviceid,
+                objectid=self.objectid,
+                propertyid=self.write_propertyid,
+                value=value,
+                array_index=None,
+                priority=None,
+            )
+        except EcoPanelError:
+            # A newer value may have been set while writing
+            if self._optimistic_value == value:
+                self._optimistic_value = None
+                self.async_write_ha_state()
+            raise
+
+        if (
+            not self.write_optimistic
+            or self._optimistic_value != value
+            or self._unsub_confirm is not None
+        ):
+            return
+
+        if self._async_write_confirmed(value):
+            self._optimistic_value = None
+            self.async_write_ha_state()
+            return
+
+        self._unsub_confirm = async_call_later(
+            self.hass, WRITE_CONFIRM_TIMEOUT, self._async_confirm_timeout
+        )
+
+    @callback
+    def _async_write_confirmed(self, value: Any) -> bool:
+        """Return if the object reports a written presentValue."""
+        return written_value_matches(self.bacnet_object.presentValue, value)
+
+    @callback
+    def _async_confirm_timeout(self, _now: datetime) -> None:
+        """Roll back a written value that wasn't confirmed in time."""
+        self._unsub_confirm = None
+
+        LOGGER.warning(
+            f"{self.deviceid} {self.objectid} didn't report {self._optimistic_value} "
+            f"back within {WRITE_CONFIRM_TIMEOUT.total_seconds():.0f} seconds"
+        )
+
+        self._unconfirmed_value = self._optimistic_value
+        self._optimistic_value = None
+        self._write_unconfirmed = True
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_confirm(self) -> None:
+        """Stop the confirmation timeout of a written value."""
+        if self._unsub_confirm is not None:
+            self._unsub_confirm()
+            self._unsub_confirm = None
@@ -1,11 +1,22 @@
 """Helper functions for the integration"""
 
+import hashlib
 import math
 import string
+import sys
+from collections.abc import Mapping
 from logging import BASIC_FORMAT
+from types import MappingProxyType
+from typing import Any, Final
+
+from aioecopanel import Device, DeviceDict
 
 from homeassistant.components.number import NumberDeviceClass
+from homeassistant.components.number.const import \
+    DEVICE_CLASS_UNITS as NUMBER_DEVICE_CLASS_UNITS
 from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.components.sensor.const import \
+    DEVICE_CLASS_UNITS as SENSOR_DEVICE_CLASS_UNITS
 from homeassistant.const import (CONCENTRATION_MICROGRAMS_PER_CUBIC_FOOT,
                                  CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
                                  CONCENTRATION_MILLIGRAMS_PER_CUBIC_METER,
@@ -40,526 +51,372 @@ def key_to_property(key: str | None) -> str | None:
             return None
 
 
+def written_value_matches(reported: Any, value: Any) -> bool:
+    """Return if a value reported by an object is the value that was written to it"""
+    if isinstance(reported, str) and reported in {"active", "inactive"}:
+        return (reported == "active") == bool(value)
+
+    try:
+        return math.isclose(float(reported), float(value), abs_tol=1e-6)
+    except (TypeError, ValueError):
+        return reported == value
+
+
+def device_to_dict(device: Device) -> dict[str, dict[str, Any]]:
+    """Device to the add-on's JSON layout, leaving out properties that aren't set"""
+    return {
+        objectid: {
+            key: value
+            for key, value in vars(bacnet_object).items()
+            if value is not None
+        }
+        for objectid, bacnet_object in device.objects.items()
+    }
+
+
+def devicedict_to_dict(devicedict: DeviceDict) -> dict[str, dict[str, dict[str, Any]]]:
+    """DeviceDict to the add-on's JSON layout, leaving out properties that aren't set"""
+    return {
+        deviceid: device_to_dict(device)
+        for deviceid, device in devicedict.devices.items()
+    }
+
+
+def _value_size(value: Any) -> int:
+    """Approximate size of a property value in bytes, items of lists included"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(_value_size(item) for item in value)
+    return size
+
+
+def devicedict_size(devicedict: DeviceDict) -> int:
+    """Approximate memory used by a DeviceDict in bytes, shared values counted each time"""
+    size = sys.getsizeof(devicedict.devices)
+    for device in devicedict.devices.values():
+        size += sys.getsizeof(device) + sys.getsizeof(device.objects)
+        for bacnet_object in device.objects.values():
+            properties = vars(bacnet_object)
+            size += sys.getsizeof(bacnet_object) + sys.getsizeof(properties)
+            size += sum(_value_size(value) for value in properties.values())
+    return size
+
+
+# Properties of BACnet objects that only change when a device is reconfigured
+METADATA_PROPERTIES: Final = (
+    "objectIdentifier",
+    "objectName",
+    "description",
+    "units",
+    "resolution",
+    "covIncrement",
+    "minPresValue",
+    "maxPresValue",
+    "stateText",
+    "numberOfStates",
+    "vendorName",
+    "modelName",
+)
+
+
+def metadata_revision(device: Device) -> str:
+    """Revision of the metadata of a device, changes when any of its metadata does"""
+    metadata = sorted(
+        (objectid, [getattr(bacnet_object, prop) for prop in METADATA_PROPERTIES])
+        for objectid, bacnet_object in device.objects.items()
+    )
+    return hashlib.sha1(repr(metadata).encode()).hexdigest()
+
+
+# BACnet engineering units to Home Assistant units, None where there is no equivalent
+BACNET_TO_HA_UNITS: Final[Mapping[str, str | None]] = MappingProxyType(
+    {
+        "amperes": UnitOfElectricCurrent.AMPERE,
+        "ampereSeconds": None,
+        "amperesPerMeter": None,
+        "amperesPerSquareMeter": None,
+        "ampereSquareHours": None,
+        "ampereSquareMeters": None,
+        "bars": None,
+        "becquerels": None,
+        "btus": None,
+        "btusPerHour": UnitOfPower.BTU_PER_HOUR,
+        "btusPerPound": None,
+        "btusPerPoundDryAir": None,
+        "candelas": None,
+        "candelasPerSquareMeter": None,
+        "centimeters": UnitOfLength.CENTIMETERS,
+        "centimetersOfMercury": None,
+        "centimetersOfWater": UnitOfPrecipitationDepth.CENTIMETERS,
+        "cubicFeet": UnitOfVolume.CUBIC_FEET,
+        "cubicFeetPerDay": None,
+        "cubicFeetPerHour": None,
+        "cubicFeetPerMinute": UnitOfVolumeFlowRate.CUBIC_FEET_PER_MINUTE,
+        "cubicFeetPerSecond": None,
+        "cubicMeters": UnitOfVolume.CUBIC_METERS,
+        "cubicMetersPerDay": None,
+        "cubicMetersPerHour": UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR,
+        "cubicMetersPerMinute": None,
+        "cubicMetersPerSecond": None,
+        "currency10": None,
+        "currency1": None,
+        "currency2": None,
+        "currency3": None,
+        "currency4": None,
+        "currency5": None,
+        "currency6": None,
+        "currency7": None,
+        "currency8": None,
+        "currency9": None,
+        "cyclesPerHour": None,
+        "cyclesPerMinute": None,
+        "days": UnitOfTime.DAYS,
+        "decibels": UnitOfSoundPressure.DECIBEL,
+        "decibelsA": UnitOfSoundPressure.WEIGHTED_DECIBEL_A,
+        "decibelsMillivolt": None,
+        "decibelsVolt": None,
+        "degreeDaysCelsius": None,
+        "degreeDaysFahrenheit": None,
+        "degreesAngular": DEGREE,
+        "degreesCelsius": UnitOfTemperature.CELSIUS,
+        "degreesCelsiusPerHour": None,
+        "degreesCelsiusPerMinute": None,
+        "degreesFahrenheit": UnitOfTemperature.FAHRENHEIT,
+        "degreesFahrenheitPerHour": None,
+        "degreesFahrenheitPerMinute": None,
+        "degreesKelvin": UnitOfTemperature.KELVIN,
+        "degreesKelvinPerHour": None,
+        "degreesKelvinPerMinute": None,
+        "degreesPhase": DEGREE,
+        "deltaDegreesFahrenheit": None,
+        "deltaDegreesKelvin": None,
+        "farads": None,
+        "feet": UnitOfLength.FEET,
+        "feetPerMinute": None,
+        "feetPerSecond": UnitOfSpeed.FEET_PER_SECOND,
+        "footCandles": None,
+        "grams": UnitOfMass.GRAMS,
+        "gramsOfWaterPerKilogramDryAir": None,
+        "gramsPerCubicCentimeter": None,
+        "gramsPerCubicMeter": None,
+        "gramsPerGram": None,
+        "gramsPerKilogram": None,
+        "gramsPerLiter": None,
+        "gramsPerMilliliter": None,
+        "gramsPerMinute": None,
+        "gramsPerSecond": None,
+        "gramsPerSquareMeter": None,
+        "gray": None,
+        "hectopascals": UnitOfPressure.HPA,
+        "henrys": None,
+        "hertz": UnitOfFrequency.HERTZ,
+        "horsepower": None,
+        "hours": UnitOfTime.HOURS,
+        "hundredthsSeconds": None,
+        "imperialGallons": None,
+        "imperialGallonsPerMinute": None,
+        "inches": UnitOfLength.INCHES,
+        "inchesOfMercury": None,
+        "inchesOfWater": UnitOfPrecipitationDepth.INCHES,
+        "joules": None,
+        "jouleSeconds": None,
+        "joulesPerCubicMeter": None,
+        "joulesPerDegreeKelvin": None,
+        "joulesPerHours": None,
+        "joulesPerKilogramDegreeKelvin": None,
+        "joulesPerKilogramDryAir": None,
+        "kilobecquerels": None,
+        "kiloBtus": None,
+        "kiloBtusPerHour": None,
+        "kilograms": UnitOfMass.KILOGRAMS,
+        "kilogramsPerCubicMeter": None,
+        "kilogramsPerHour": None,
+        "kilogramsPerKilogram": None,
+        "kilogramsPerMinute": None,
+        "kilogramsPerSecond": None,
+        "kilohertz": UnitOfFrequency.KILOHERTZ,
+        "kilohms": None,
+        "kilojoules": None,
+        "kilojoulesPerDegreeKelvin": None,
+        "kilojoulesPerKilogram": None,
+        "kilojoulesPerKilogramDryAir": None,
+        "kilometers": UnitOfLength.KILOMETERS,
+        "kilometersPerHour": UnitOfSpeed.KILOMETERS_PER_HOUR,
+        "kilopascals": UnitOfPressure.KPA,
+        "kilovoltAmpereHours": None,
+        "kilovoltAmpereHoursReactive": None,
+        "kilovoltAmperes": UnitOfApparentPower.VOLT_AMPERE,
+        "kilovoltAmperesReactive": None,
+        "kilovolts": None,
+        "kilowattHours": UnitOfEnergy.KILO_WATT_HOUR,
+        "kilowattHoursPerSquareFoot": None,
+        "kilowattHoursPerSquareMeter": None,
+        "kilowattHoursReactive": None,
+        "kilowatts": UnitOfPower.KILO_WATT,
+        "liters": UnitOfVolume.LITERS,
+        "litersPerHour": None,
+        "litersPerMinute": UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
+        "litersPerSecond": None,
+        "lumens": None,
+        "luxes": LIGHT_LUX,
+        "megabecquerels": None,
+        "megaBtus": None,
+        "megahertz": UnitOfFrequency.MEGAHERTZ,
+        "megajoules": UnitOfEnergy.MEGA_JOULE,
+        "megajoulesPerDegreeKelvin": None,
+        "megajoulesPerKilogramDryAir": None,
+        "megajoulesPerSquareFoot": None,
+        "megajoulesPerSquareMeter": None,
+        "megavoltAmpereHours": None,
+        "megavoltAmpereHoursReactive": None,
+        "megavoltAmperes": None,
+        "megavoltAmperesReactive": None,
+        "megavolts": None,
+        "megawattHours": UnitOfEnergy.MEGA_WATT_HOUR,
+        "megawattHoursReactive": None,
+        "megawatts": None,
+        "megohms": None,
+        "meters": UnitOfLength.METERS,
+        "metersPerHour": None,
+        "metersPerMinute": None,
+        "metersPerSecond": UnitOfSpeed.METERS_PER_SECOND,
+        "metersPerSecondPerSecond": None,
+        "microgramsPerCubicMeter": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+        "microgramsPerLiter": None,
+        "microgray": None,
+        "micrometers": None,
+        "microSiemens": None,
+        "microsieverts": None,
+        "microsievertsPerHour": None,
+        "milesPerHour": UnitOfSpeed.MILES_PER_HOUR,
+        "milliamperes": UnitOfElectricCurrent.MILLIAMPERE,
+        "millibars": UnitOfPressure.MBAR,
+        "milligrams": UnitOfMass.MILLIGRAMS,
+        "milligramsPerCubicMeter": CONCENTRATION_MILLIGRAMS_PER_CUBIC_METER,
+        "milligramsPerGram": None,
+        "milligramsPerKilogram": None,
+        "milligramsPerLiter": None,
+        "milligray": None,
+        "milliliters": UnitOfVolume.MILLILITERS,
+        "millilitersPerSecond": None,
+        "millimeters": UnitOfLength.MILLIMETERS,
+        "millimetersOfMercury": None,
+        "millimetersOfWater": UnitOfPrecipitationDepth.MILLIMETERS,
+        "millimetersPerMinute": None,
+        "millimetersPerSecond": None,
+        "milliohms": None,
+        "milliseconds": UnitOfTime.MILLISECONDS,
+        "millisiemens": None,
+        "millisieverts": None,
+        "millivolts": UnitOfElectricPotential.MILLIVOLT,
+        "milliwatts": None,
+        "minutes": UnitOfTime.MINUTES,
+        "minutesPerDegreeKelvin": None,
+        "months": UnitOfTime.MONTHS,
+        "nanogramsPerCubicMeter": None,
+        "nephelometricTurbidityUnit": None,
+        "newton": None,
+        "newtonMeters": None,
+        "newtonSeconds": None,
+        "newtonsPerMeter": None,
+        "noUnits": None,
+        "ohmMeterPerSquareMeter": None,
+        "ohmMeters": None,
+        "ohms": None,
+        "partsPerBillion": CONCENTRATION_PARTS_PER_BILLION,
+        "partsPerMillion": CONCENTRATION_PARTS_PER_MILLION,
+        "pascals": UnitOfPressure.PA,
+        "pascalSeconds": None,
+        "percent": PERCENTAGE,
+        "percentObscurationPerFoot": None,
+        "percentObscurationPerMeter": None,
+        "percentPerSecond": None,
+        "percentRelativeHumidity": PERCENTAGE,
+        "perHour": None,
+        "perMille": None,
+        "perMinute": None,
+        "perSecond": None,
+        "pH": None,
+        "poundsForcePerSquareInch": UnitOfPressure.PSI,
+        "poundsMass": UnitOfMass.POUNDS,
+        "poundsMassPerHour": None,
+        "poundsMassPerMinute": None,
+        "poundsMassPerSecond": None,
+        "powerFactor": None,
+        "psiPerDegreeFahrenheit": None,
+        "radians": None,
+        "radiansPerSecond": None,
+        "revolutionsPerMinute": REVOLUTIONS_PER_MINUTE,
+        "seconds": UnitOfTime.SECONDS,
+        "siemens": None,
+        "siemensPerMeter": None,
+        "sieverts": None,
+        "squareCentimeters": None,
+        "squareFeet": None,
+        "squareInches": None,
+        "squareMeters": UnitOfArea.SQUARE_METERS,
+        "squareMetersPerNewton": None,
+        "teslas": None,
+        "therms": None,
+        "tonHours": None,
+        "tons": None,
+        "tonsPerHour": None,
+        "tonsRefrigeration": None,
+        "usGallons": UnitOfVolume.GALLONS,
+        "usGallonsPerHour": None,
+        "usGallonsPerMinute": UnitOfVolumeFlowRate.GALLONS_PER_MINUTE,
+        "voltAmpereHours": None,
+        "voltAmpereHoursReactive": UnitOfReactivePower.VOLT_AMPERE_REACTIVE,
+        "voltAmperes": None,
+        "voltAmperesReactive": None,
+        "volts": UnitOfElectricPotential.VOLT,
+        "voltsPerDegreeKelvin": None,
+        "voltsPerMeter": None,
+        "voltsSquareHours": None,
+        "wattHours": UnitOfEnergy.WATT_HOUR,
+        "wattHoursPerCubicMeter": None,
+        "wattHoursReactive": None,
+        "watts": UnitOfPower.WATT,
+        "wattsPerMeterPerDegreeKelvin": None,
+        "wattsPerSquareFoot": None,
+        "wattsPerSquareMeter": UnitOfIrradiance.WATTS_PER_SQUARE_METER,
+        "wattsPerSquareMeterDegreeKelvin": None,
+        "webers": None,
+        "weeks": UnitOfTime.WEEKS,
+        "years": UnitOfTime.YEARS,
+    }
+)
+
+
+def _device_classes_by_unit(
+    device_class_units: Mapping[str, set],
+) -> Mapping[str, str]:
+    """BACnet engineering unit to the first device class that supports its unit"""
+    device_classes: dict[str, str] = {}
+    for unit_in, unit in BACNET_TO_HA_UNITS.items():
+        if unit is None:
+            continue
+        for device_class, units in device_class_units.items():
+            if unit in units:
+                device_classes[unit_in] = device_class
+                break
+    return MappingProxyType(device_classes)
+
+
+SENSOR_DEVICE_CLASSES: Final = _device_classes_by_unit(SENSOR_DEVICE_CLASS_UNITS)
+NUMBER_DEVICE_CLASSES: Final = _device_classes_by_unit(NUMBER_DEVICE_CLASS_UNITS)
+
+
 def bacnet_to_ha_units(unit_in: str | None) -> str | None:
-    match unit_in:
-        case "amperes":
-            return UnitOfElectricCurrent.AMPERE
-        case "ampereSeconds":
-            return None
-        case "amperesPerMeter":
-            return None
-        case "amperesPerSquareMeter":
-            return None
-        case "ampereSquareHours":
-            return None
-        case "ampereSquareMeters":
-            return None
-        case "bars":
-            return None
-        case "becquerels":
-            return None
-        case "btus":
-            return None
-        case "btusPerHour":
-            return UnitOfPower.BTU_PER_HOUR
-        case "btusPerPound":
-            return None
-        case "btusPerPoundDryAir":
-            return None
-        case "candelas":
-            return None
-        case "candelasPerSquareMeter":
-            return None
-        case "centimeters":
-            return UnitOfLength.CENTIMETERS
-        case "centimetersOfMercury":
-            return None
-        case "centimetersOfWater":
-            return UnitOfPrecipitationDepth.CENTIMETERS
-        case "cubicFeet":
-            return UnitOfVolume.CUBIC_FEET
-        case "cubicFeetPerDay":
-            return None
-        case "cubicFeetPerHour":
-            return None
-        case "cubicFeetPerMinute":
-            return UnitOfVolumeFlowRate.CUBIC_FEET_PER_MINUTE
-        case "cubicFeetPerSecond":
-            return None
-        case "cubicMeters":
-            return UnitOfVolume.CUBIC_METERS
-        case "cubicMetersPerDay":
-            return None
-        case "cubicMetersPerHour":
-            return UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR
-        case "cubicMetersPerMinute":
-            return None
-        case "cubicMetersPerSecond":
-            return None
-        case "currency10":
-            return None
-        case "currency1":
-            return None
-        case "currency2":
-            return None
-        case "currency3":
-            return None
-        case "currency4":
-            return None
-        case "currency5":
-            return None
-        case "currency6":
-            return None
-        case "currency7":
-            return None
-        case "currency8":
-            return None
-        case "currency9":
-            return None
-        case "cyclesPerHour":
-            return None
-        case "cyclesPerMinute":
-            return None
-        case "days":
-            return UnitOfTime.DAYS
-        case "decibels":
-            return UnitOfSoundPressure.DECIBEL
-        case "decibelsA":
-            return UnitOfSoundPressure.WEIGHTED_DECIBEL_A
-        case "decibelsMillivolt":
-            return None
-        case "decibelsVolt":
-            return None
-        case "degreeDaysCelsius":
-            return None
-        case "degreeDaysFahrenheit":
-            return None
-        case "degreesAngular":
-            return DEGREE
-        case "degreesCelsius":
-            return UnitOfTemperature.CELSIUS
-        case "degreesCelsiusPerHour":
-            return None
-        case "degreesCelsiusPerMinute":
-            return None
-        case "degreesFahrenheit":
-            return UnitOfTemperature.FAHRENHEIT
-        case "degreesFahrenheitPerHour":
-            return None
-        case "degreesFahrenheitPerMinute":
-            return None
-        case "degreesKelvin":
-            return UnitOfTemperature.KELVIN
-        case "degreesKelvinPerHour":
-            return None
-        case "degreesKelvinPerMinute":
-            return None
-        case "degreesPhase":
-            return DEGREE
-        case "deltaDegreesFahrenheit":
-            return None
-        case "deltaDegreesKelvin":
-            return None
-        case "farads":
-            return None
-        case "feet":
-            return UnitOfLength.FEET
-        case "feetPerMinute":
-            return None
-        case "feetPerSecond":
-            return UnitOfSpeed.FEET_PER_SECOND
-        case "footCandles":
-            return None
-        case "grams":
-            return UnitOfMass.GRAMS
-        case "gramsOfWaterPerKilogramDryAir":
-            return None
-        case "gramsPerCubicCentimeter":
-            return None
-        case "gramsPerCubicMeter":
-            return None
-        case "gramsPerGram":
-            return None
-        case "gramsPerKilogram":
-            return None
-        case "gramsPerLiter":
-            return None
-        case "gramsPerMilliliter":
-            return None
-        case "gramsPerMinute":
-            return None
-        case "gramsPerSecond":
-            return None
-        case "gramsPerSquareMeter":
-            return None
-        case "gray":
-            return None
-        case "hectopascals":
-            return UnitOfPressure.HPA
-        case "henrys":
-            return None
-        case "hertz":
-            return UnitOfFrequency.HERTZ
-        case "horsepower":
-            return None
-        case "hours":
-            return UnitOfTime.HOURS
-        case "hundredthsSeconds":
-            return None
-        case "imperialGallons":
-            return None
-        case "imperialGallonsPerMinute":
-            return None
-        case "inches":
-            return UnitOfLength.INCHES
-        case "inchesOfMercury":
-            return None
-        case "inchesOfWater":
-            return UnitOfPrecipitationDepth.INCHES
-        case "joules":
-            return None
-        case "jouleSeconds":
-            return None
-        case "joulesPerCubicMeter":
-            return None
-        case "joulesPerDegreeKelvin":
-            return None
-        case "joulesPerHours":
-            return None
-        case "joulesPerKilogramDegreeKelvin":
-            return None
-        case "joulesPerKilogramDryAir":
-            return None
-        case "kilobecquerels":
-            return None
-        case "kiloBtus":
-            return None
-        case "kiloBtusPerHour":
-            return None
-        case "kilograms":
-            return UnitOfMass.KILOGRAMS
-        case "kilogramsPerCubicMeter":
-            return None
-        case "kilogramsPerHour":
-            return None
-        case "kilogramsPerKilogram":
-            return None
-        case "kilogramsPerMinute":
-            return None
-        case "kilogramsPerSecond":
-            return None
-        case "kilohertz":
-            return UnitOfFrequency.KILOHERTZ
-        case "kilohms":
-            return None
-        case "kilojoules":
-            return None
-        case "kilojoulesPerDegreeKelvin":
-            return None
-        case "kilojoulesPerKilogram":
-            return None
-        case "kilojoulesPerKilogramDryAir":
-            return None
-        case "kilometers":
-            return UnitOfLength.KILOMETERS
-        case "kilometersPerHour":
-            return UnitOfSpeed.KILOMETERS_PER_HOUR
-        case "kilopascals":
-            return UnitOfPressure.KPA
-        case "kilovoltAmpereHours":
-            return None
-        case "kilovoltAmpereHoursReactive":
-            return None
-        case "kilovoltAmperes":
-            return UnitOfApparentPower.VOLT_AMPERE
-        case "kilovoltAmperesReactive":
-            return None
-        case "kilovolts":
-            return None
-        case "kilowattHours":
-            return UnitOfEnergy.KILO_WATT_HOUR
-        case "kilowattHoursPerSquareFoot":
-            return None
-        case "kilowattHoursPerSquareMeter":
-            return None
-        case "kilowattHoursReactive":
-            return None
-        case "kilowatts":
-            return UnitOfPower.KILO_WATT
-        case "liters":
-            return UnitOfVolume.LITERS
-        case "litersPerHour":
-            return None
-        case "litersPerMinute":
-            return UnitOfVolumeFlowRate.LITERS_PER_MINUTE
-        case "litersPerSecond":
-            return None
-        case "lumens":
-            return None
-        case "luxes":
-            return LIGHT_LUX
-        case "megabecquerels":
-            return None
-        case "megaBtus":
-            return None
-        case "megahertz":
-            return UnitOfFrequency.MEGAHERTZ
-        case "megajoules":
-            return UnitOfEnergy.MEGA_JOULE
-        case "megajoulesPerDegreeKelvin":
-            return None
-        case "megajoulesPerKilogramDryAir":
-            return None
-        case "megajoulesPerSquareFoot":
-            return None
-        case "megajoulesPerSquareMeter":
-            return None
-        case "megavoltAmpereHours":
-            return None
-        case "megavoltAmpereHoursReactive":
-            return None
-        case "megavoltAmperes":
-            return None
-        case "megavoltAmperesReactive":
-            return None
-        case "megavolts":
-            return None
-        case "megawattHours":
-            return UnitOfEnergy.MEGA_WATT_HOUR
-        case "megawattHoursReactive":
-            return None
-        case "megawatts":
-            return None
-        case "megohms":
-            return None
-        case "meters":
-            return UnitOfLength.METERS
-        case "metersPerHour":
-            return None
-        case "metersPerMinute":
-            return None
-        case "metersPerSecond":
-            return UnitOfSpeed.METERS_PER_SECOND
-        case "metersPerSecondPerSecond":
-            return None
-        case "microgramsPerCubicMeter":
-            return CONCENTRATION_MICROGRAMS_PER_CUBIC_METER
-        case "microgramsPerLiter":
-            return None
-        case "microgray":
-            return None
-        case "micrometers":
-            return None
-        case "microSiemens":
-            return None
-        case "microsieverts":
-            return None
-        case "microsievertsPerHour":
-            return None
-        case "milesPerHour":
-            return UnitOfSpeed.MILES_PER_HOUR
-        case "milliamperes":
-            return UnitOfElectricCurrent.MILLIAMPERE
-        case "millibars":
-            return UnitOfPressure.MBAR
-        case "milligrams":
-            return UnitOfMass.MILLIGRAMS
-        case "milligramsPerCubicMeter":
-            return CONCENTRATION_MILLIGRAMS_PER_CUBIC_METER
-        case "milligramsPerGram":
-            return None
-        case "milligramsPerKilogram":
-            return None
-        case "milligramsPerLiter":
-            return None
-        case "milligray":
-            return None
-        case "milliliters":
-            return UnitOfVolume.MILLILITERS
-        case "millilitersPerSecond":
-            return None
-        case "millimeters":
-            return UnitOfLength.MILLIMETERS
-        case "millimetersOfMercury":
-            return None
-        case "millimetersOfWater":
-            return UnitOfPrecipitationDepth.MILLIMETERS
-        case "millimetersPerMinute":
-            return None
-        case "millimetersPerSecond":
-            return None
-        case "milliohms":
-            return None
-        case "milliseconds":
-            return UnitOfTime.MILLISECONDS
-        case "millisiemens":
-            return None
-        case "millisieverts":
-            return None
-        case "millivolts":
-            return UnitOfElectricPotential.MILLIVOLT
-        case "milliwatts":
-            return None
-        case "minutes":
-            return UnitOfTime.MINUTES
-        case "minutesPerDegreeKelvin":
-            return None
-        case "months":
-            return UnitOfTime.MONTHS
-        case "nanogramsPerCubicMeter":
-            return None
-        case "nephelometricTurbidityUnit":
-            return None
-        case "newton":
-            return None
-        case "newtonMeters":
-            return None
-        case "newtonSeconds":
-            return None
-        case "newtonsPerMeter":
-            return None
-        case "noUnits":
-            return None
-        case "ohmMeterPerSquareMeter":
-            return None
-        case "ohmMeters":
-            return None
-        case "ohms":
-            return None
-        case "partsPerBillion":
-            return CONCENTRATION_PARTS_PER_BILLION
-        case "partsPerMillion":
-            return CONCENTRATION_PARTS_PER_MILLION
-        case "pascals":
-            return UnitOfPressure.PA
-        case "pascalSeconds":
-            return None
-        case "percent":
-            return PERCENTAGE
-        case "percentObscurationPerFoot":
-            return None
-        case "percentObscurationPerMeter":
-            return None
-        case "percentPerSecond":
-            return None
-        case "percentRelativeHumidity":
-            return PERCENTAGE
-        case "perHour":
-            return None
-        case "perMille":
-            return None
-        case "perMinute":
-            return None
-        case "perSecond":
-            return None
-        case "pH":
-            return None
-        case "poundsForcePerSquareInch":
-            return UnitOfPressure.PSI
-        case "poundsMass":
-            return UnitOfMass.POUNDS
-        case "poundsMassPerHour":
-            return None
-        case "poundsMassPerMinute":
-            return None
-        case "poundsMassPerSecond":
-            return None
-        case "powerFactor":
-            return None
-        case "psiPerDegreeFahrenheit":
-            return None
-        case "radians":
-            return None
-        case "radiansPerSecond":
-            return None
-        case "revolutionsPerMinute":
-            return REVOLUTIONS_PER_MINUTE
-        case "seconds":
-            return UnitOfTime.SECONDS
-        case "siemens":
-            return None
-        case "siemensPerMeter":
-            return None
-        case "sieverts":
-            return None
-        case "squareCentimeters":
-            return None
-        case "squareFeet":
-            return None
-        case "squareInches":
-            return None
-        case "squareMeters":
-            return UnitOfArea.SQUARE_METERS
-        case "squareMetersPerNewton":
-            return None
-        case "teslas":
-            return None
-        case "therms":
-            return None
-        case "tonHours":
-            return None
-        case "tons":
-            return None
-        case "tonsPerHour":
-            return None
-        case "tonsRefrigeration":
-            return None
-        case "usGallons":
-            return UnitOfVolume.GALLONS
-        case "usGallonsPerHour":
-            return None
-        case "usGallonsPerMinute":
-            return UnitOfVolumeFlowRate.GALLONS_PER_MINUTE
-        case "voltAmpereHours":
-            return None
-        case "voltAmpereHoursReactive":
-            return UnitOfReactivePower.VOLT_AMPERE_REACTIVE
-        case "voltAmperes":
-            return None
-        case "voltAmperesReactive":
-            return None
-        case "volts":
-            return UnitOfElectricPotential.VOLT
-        case "voltsPerDegreeKelvin":
-            return None
-        case "voltsPerMeter":
-            return None
-        case "voltsSquareHours":
-            return None
-        case "wattHours":
-            return UnitOfEnergy.WATT_HOUR
-        case "wattHoursPerCubicMeter":
-            return None
-        case "wattHoursReactive":
-            return None
-        case "watts":
-            return UnitOfPower.WATT
-        case "wattsPerMeterPerDegreeKelvin":
-            return None
-        case "wattsPerSquareFoot":
-            return None
-        case "wattsPerSquareMeter":
-            return UnitOfIrradiance.WATTS_PER_SQUARE_METER
-        case "wattsPerSquareMeterDegreeKelvin":
-            return None
-        case "webers":
-            return None
-        case "weeks":
-            return UnitOfTime.WEEKS
-        case "years":
-            return UnitOfTime.YEARS
-        case _:
-            return None
+    """BACnet engineering unit to Home Assistant unit"""
+    return BACNET_TO_HA_UNITS.get(unit_in)
 
 
-def bacnet_to_device_class(unit_in: str | None, device_class_units: dict) -> str | None:
-    """BACnet engineering unit to device class"""
-    if unit := bacnet_to_ha_units(unit_in):
-        for classes, values in device_class_units.items():
-            if unit in values:
-                return classes
-    else:
-        return None
+def bacnet_to_device_class(
+    unit_in: str | None, device_classes: Mapping[str, str]
+) -> str | None:
+    """BACnet engineering unit to device class, using SENSOR_DEVICE_CLASSES or NUMBER_DEVICE_CLASSES"""
+    return device_classes.get(unit_in)
 
 
 def decimal_places_needed(resolution: float) -> int:
@@ -573,3 +430,18 @@ def decimal_places_needed(resolution: float) -> int:
     decimal_places = math.ceil(log10_value)
 
     return decimal_places
+
+
+def value_precision(
+    resolution: float | None, cov_increment: float | None
+) -> int | None:
+    """Decimal places a value with this resolution or COV increment needs, None for whole numbers"""
+    for increment in (resolution, cov_increment):
+        if not increment:
+            continue
+        if increment >= 1:
+            return None
+        if increment > 0:
+            return decimal_places_needed(increment)
+
+    return 1
@@ -1,27 +1,31 @@
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
 from statistics import mode
 from typing import Any
 
+from aioecopanel import EcoPanelError
 from homeassistant.components.number import (NumberDeviceClass, NumberEntity,
                                              NumberEntityDescription)
-from homeassistant.components.number.const import DEVICE_CLASS_UNITS
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (CONF_ENABLED, CONF_NAME, PERCENTAGE,
-                                 UnitOfElectricCurrent,
+from homeassistant.const import (PERCENTAGE, UnitOfElectricCurrent,
                                  UnitOfElectricPotential, UnitOfInformation,
                                  UnitOfIrradiance, UnitOfTemperature)
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import InvalidStateError
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.dt import utcnow
 
-from .const import CONF_ANALOG_OUTPUT, CONF_ANALOG_VALUE, DOMAIN, LOGGER
+from .const import (CONF_ANALOG_OUTPUT, CONF_ANALOG_OUTPUT_DEBOUNCE,
+                    CONF_ANALOG_VALUE, CONF_ANALOG_VALUE_DEBOUNCE,
+                    DEFAULT_WRITE_DEBOUNCE, DOMAIN, LOGGER)
 from .coordinator import EcoPanelDataUpdateCoordinator
-from .helper import bacnet_to_device_class, bacnet_to_ha_units, key_to_property
+from .entity import EcoPanelEntity, EcoPanelWritableEntity
+from .helper import (NUMBER_DEVICE_CLASSES, bacnet_to_device_class,
+                     bacnet_to_ha_units)
 
 
 async def async_setup_entry(
@@ -29,425 +33,200 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up EcoPanel sensor based on a config entry."""
+    """Set up EcoPanel number based on a config entry."""
     coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entity_list: list = []
 
-    # Collect from all devices the objects that can become a sensor
-    if not coordinator.data.devices:
-        LOGGER.warning(f"No devices received from API!")
-        return
+    @callback
+    def async_add_objects(objects: list[tuple[str, str]]) -> None:
+        """Add entities for objects of the types that can become a number."""
+        entity_list: list = []
 
-    for deviceid in coordinator.data.devices:
-        if not coordinator.data.devices[deviceid].objects:
-            LOGGER.warning(f"No objects in {deviceid}!")
-            continue
-
-        for objectid in coordinator.data.devices[deviceid].objects:
-            if (
-                not coordinator.data.devices[deviceid]
+        for deviceid, objectid in objects:
+            if not (
+                object_identifier := coordinator.data.devices[deviceid]
                 .objects[objectid]
                 .objectIdentifier
             ):
                 LOGGER.warning(f"No object identifier for {objectid} in {deviceid}!")
                 continue
 
-            if (
-                coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
-                == "analogOutput"
-            ):
-                # Object Type to ObjectIdentifier[0]
+            if object_identifier[0] == "analogOutput":
                 entity_list.append(
                     AnalogOutputEntity(
                         coordinator=coordinator, deviceid=deviceid, objectid=objectid
                     )
                 )
-            elif (
-                coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
-                == "analogValue"
-            ):
+            elif object_identifier[0] == "analogValue":
                 entity_list.append(
                     AnalogValueEntity(
                         coordinator=coordinator, deviceid=deviceid, objectid=objectid
                     )
                 )
 
-    async_add_entities(entity_list)
+        if entity_list:
+            async_add_entities(entity_list)
+
+    # Entities are created for the current objects, and for objects added later on
+    entry.async_on_unload(
+        coordinator.async_add_object_listener(
+            ("analogOutput", "analogValue"), async_add_objects
+        )
+    )
+
 
+class EcoPanelNumberEntity(EcoPanelWritableEntity, NumberEntity):
+    """Number of a BACnet object, writes to it can be debounced."""
 
-class AnalogOutputEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], NumberEntity
-):
-    _attr_has_entity_name = True
+    _attr_mode = "box"
+    _metadata_properties = (
+        *EcoPanelEntity._metadata_properties,
+        "units",
+        "resolution",
+        "covIncrement",
+        "minPresValue",
+        "maxPresValue",
+    )
+
+    # Config key of the debounce window
+    _conf_debounce: str
+    # Minimum value when the object has no minPresValue
+    _native_min_fallback: int
 
     def __init__(
         self,
         coordinator: EcoPanelDataUpdateCoordinator,
         deviceid: str,
         objectid: str,
-    ):
-        """Initialize a BACnet AnalogOutput object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
-
-    @property
-    def unique_id(self) -> str:
-        return f"{self.deviceid}_{self.objectid}"
-
-    @property
-    def name(self) -> str:
-        name = self.coordinator.config_entry.data.get(CONF_NAME, "object_name")
-        if name == "description":
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].description}"
-        elif name == "object_identifier":
-            identifier = (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .objectIdentifier
+    ) -> None:
+        """Initialize a BACnet object as number entity."""
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
+
+        # Set when a value waits for the debounce window to end
+        self._debounce_pending = False
+        self._debounce_value: float | None = None
+        # Set while the debounced values are written
+        self._debounce_writing = False
+        self._unsub_debounce: CALLBACK_TYPE | None = None
+
+        # Writes wait until no value was set for this many seconds
+        self._debounce_window: float = (
+            coordinator.config_entry.data.get(
+                self._conf_debounce, DEFAULT_WRITE_DEBOUNCE
             )
-            return f"{identifier[0]}:{identifier[1]}"
-        else:
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].objectName}"
+            / 1000
+        )
 
-    @property
-    def icon(self):
-        return "mdi:gesture-swipe-vertical"
+    async def async_will_remove_from_hass(self) -> None:
+        """Write a value that's still waiting for the debounce window."""
+        self._async_cancel_debounce()
 
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return if the entity should be enabled when first added to the entity registry."""
-        return self.coordinator.config_entry.data.get(CONF_ENABLED, False)
+        # A write that's in flight writes the waiting value after it
+        if self._debounce_pending and not self._debounce_writing:
+            await self._async_write_debounced()
 
-    @property
-    def mode(self) -> str:
-        return "box"
-
-    @property
-    def native_step(self):
-        if (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .resolution
-        ):
-            return (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .resolution
-            )
-        elif (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .covIncrement
-        ):
-            return (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .covIncrement
-            )
-        else:
-            return float(0.1)
+        await super().async_will_remove_from_hass()
 
     @property
     def native_value(self):
-        value = self.coordinator.data.devices[self.deviceid].objects[self.objectid].presentValue
-    
-        if value is None:
+        if (value := self.present_value) is None:
             raise InvalidStateError
-    
-        value = float(value)
-        return int(value) if self.native_step >= 1 else value
-
-    @property
-    def native_max_value(self):
-        if (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .maxPresValue
-        ):
-            return (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .maxPresValue
-            )
-        else:
-            return 2147483647
-
-    @property
-    def native_min_value(self):
-        if (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .minPresValue
-        ):
-            return (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .minPresValue
-            )
-        else:
-            return -2147483648
-
-    @property
-    def native_unit_of_measurement(self) -> str | None:
-        if (
-            units := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .units
-        ):
-            return bacnet_to_ha_units(units)
-        else:
-            return None
-
-    @property
-    def device_class(self) -> str | None:
-        if (
-            units := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .units
-        ):
-            return bacnet_to_device_class(units, DEVICE_CLASS_UNITS)
-        else:
-            return None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
+        value = float(value)
+        return int(value) if self._attr_native_step >= 1 else value
 
     async def async_set_native_value(self, value: float) -> None:
-        """Set analogOutput object to active."""
+        """Write a value to the object, or show it until the debounce window ends."""
 
-        propertyid = self.coordinator.config_entry.data.get(
-            CONF_ANALOG_OUTPUT, "present_value"
-        )
+        if not self._debounce_window:
+            await self._async_write_value(value)
+            return
 
-        await self.coordinator.interface.write_property_v2(
-            deviceid=self.deviceid,
-            objectid=self.objectid,
-            propertyid=key_to_property(propertyid),
-            value=value,
-            array_index=None,
-            priority=None,
-        )
+        self._async_set_optimistic(value)
+        self._debounce_pending = True
+        self._debounce_value = value
 
+        # Every value that's set starts the window again
+        self._async_cancel_debounce()
+        self._unsub_debounce = async_call_later(
+            self.hass, self._debounce_window, self._async_debounce_elapsed
+        )
 
-class AnalogValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], NumberEntity):
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        coordinator: EcoPanelDataUpdateCoordinator,
-        deviceid: str,
-        objectid: str,
-    ):
-        """Initialize a BACnet AnalogValue object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
-
-    @property
-    def unique_id(self) -> str:
-        return f"{self.deviceid}_{self.objectid}"
+    @callback
+    def _async_update_metadata(self) -> None:
+        super()._async_update_metadata()
 
-    @property
-    def name(self) -> str:
-        name = self.coordinator.config_entry.data.get(CONF_NAME, "object_name")
-        if name == "description":
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].description}"
-        elif name == "object_identifier":
-            identifier = (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .objectIdentifier
-            )
-            return f"{identifier[0]}:{identifier[1]}"
+        if resolution := self.bacnet_object.resolution:
+            self._attr_native_step = resolution
+        elif covIncrement := self.bacnet_object.covIncrement:
+            self._attr_native_step = float(covIncrement)
         else:
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].objectName}"
-
-    @property
-    def icon(self):
-        return "mdi:pencil"
+            self._attr_native_step = float(0.1)
 
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return if the entity should be enabled when first added to the entity registry."""
-        return self.coordinator.config_entry.data.get(CONF_ENABLED, False)
-
-    @property
-    def mode(self) -> str:
-        return "box"
-
-    @property
-    def native_step(self):
-        if (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .resolution
-        ):
-            return (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .resolution
-            )
-        elif (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .covIncrement
-        ):
-            return float(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .covIncrement
-            )
+        if max_pres_value := self.bacnet_object.maxPresValue:
+            self._attr_native_max_value = max_pres_value
         else:
-            return float(0.1)
+            self._attr_native_max_value = 2147483647
 
-    @property
-    def native_value(self):
-        value = self.coordinator.data.devices[self.deviceid].objects[self.objectid].presentValue
-    
-        if value is None:
-            raise InvalidStateError
-    
-        value = float(value)
-        return int(value) if self.native_step >= 1 else value
-
-    @property
-    def native_max_value(self):
-        if (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .maxPresValue
-        ):
-            return (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .maxPresValue
-            )
+        if min_pres_value := self.bacnet_object.minPresValue:
+            self._attr_native_min_value = min_pres_value
         else:
-            return 2147483647
+            self._attr_native_min_value = self._native_min_fallback
 
-    @property
-    def native_min_value(self):
-        if (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .minPresValue
-        ):
-            return (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .minPresValue
-            )
-        else:
-            return -2147483647
-
-    @property
-    def native_unit_of_measurement(self) -> str | None:
-        if (
-            units := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .units
-        ):
-            return bacnet_to_ha_units(units)
+        if units := self.bacnet_object.units:
+            self._attr_native_unit_of_measurement = bacnet_to_ha_units(units)
+            self._attr_device_class = bacnet_to_device_class(units, NUMBER_DEVICE_CLASSES)
         else:
-            return None
+            self._attr_native_unit_of_measurement = None
+            self._attr_device_class = None
+
+    @callback
+    def _async_debounce_elapsed(self, _now: datetime) -> None:
+        """Write the last value once no value was set for the debounce window."""
+        self._unsub_debounce = None
+
+        # A write that's in flight writes the value after it
+        if not self._debounce_writing:
+            self.hass.async_create_task(
+                self._async_write_debounced(),
+                f"bacnet-debounce-{self.deviceid}-{self.objectid}",
+            )
 
-    @property
-    def device_class(self) -> str | None:
-        if (
-            units := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .units
-        ):
-            return bacnet_to_device_class(units, DEVICE_CLASS_UNITS)
-        else:
-            return None
+    async def _async_write_debounced(self) -> None:
+        """Write the last value that was set, and the values set while writing."""
+
+        self._debounce_writing = True
+        try:
+            # A value set while writing is written next, unless its window is still open
+            while self._debounce_pending and self._unsub_debounce is None:
+                self._debounce_pending = False
+                value = self._debounce_value
+
+                try:
+                    await self._async_write_value(value)
+                except EcoPanelError as err:
+                    LOGGER.error(
+                        f"Failed to write {value} to {self.deviceid} {self.objectid}: {err}"
+                    )
+        finally:
+            self._debounce_writing = False
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
+    @callback
+    def _async_cancel_debounce(self) -> None:
+        """Stop the debounce window of a waiting value."""
+        if self._unsub_debounce is not None:
+            self._unsub_debounce()
+            self._unsub_debounce = None
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
 
-    async def async_set_native_value(self, value: float) -> None:
-        """Set analogOutput object to active."""
+class AnalogOutputEntity(EcoPanelNumberEntity):
+    _attr_icon = "mdi:gesture-swipe-vertical"
+    _conf_write_property = CONF_ANALOG_OUTPUT
+    _conf_debounce = CONF_ANALOG_OUTPUT_DEBOUNCE
+    _native_min_fallback = -2147483648
 
-        propertyid = self.coordinator.config_entry.data.get(
-            CONF_ANALOG_VALUE, "present_value"
-        )
 
-        await self.coordinator.interface.write_property_v2(
-            deviceid=self.deviceid,
-            objectid=self.objectid,
-            propertyid=key_to_property(propertyid),
-            value=value,
-            array_index=None,
-            priority=None,
-        )
+class AnalogValueEntity(EcoPanelNumberEntity):
+    _attr_icon = "mdi:pencil"
+    _conf_write_property = CONF_ANALOG_VALUE
+    _conf_debounce = CONF_ANALOG_VALUE_DEBOUNCE
+    _native_min_fallback = -2147483647
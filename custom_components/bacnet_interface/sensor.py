@@ -1,3 +1,4 @@
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from math import log10
@@ -6,22 +7,125 @@ from typing import Any
 from homeassistant.components.sensor import (SensorDeviceClass, SensorEntity,
                                              SensorEntityDescription,
                                              SensorStateClass)
-from homeassistant.components.sensor.const import DEVICE_CLASS_UNITS
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (CONF_ENABLED, CONF_NAME, UnitOfEnergy,
-                                 UnitOfVolume)
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfEnergy, UnitOfTime, UnitOfVolume
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.dt import utcnow
 
 from .const import STATETEXT_OFFSET  # JCO
-from .const import DOMAIN, LOGGER
+from .const import CONF_HEALTH_SENSORS, DOMAIN, HEALTH_SCAN_INTERVAL, LOGGER
 from .coordinator import EcoPanelDataUpdateCoordinator
-from .helper import (bacnet_to_device_class, bacnet_to_ha_units,
-                     decimal_places_needed)
+from .entity import EcoPanelEntity
+from .helper import (SENSOR_DEVICE_CLASSES, bacnet_to_device_class,
+                     bacnet_to_ha_units, value_precision)
+from .stats import LatencyHistogram, RollingWindow
+
+# Only the integration health sensors poll, their figures are read this often
+SCAN_INTERVAL = HEALTH_SCAN_INTERVAL
+
+
+def _ingest_time(coordinator: EcoPanelDataUpdateCoordinator, percentile: float) -> StateType:
+    """Percentile of the handling time of updates in milliseconds.
+
+    Dispatches are timed, not websocket messages: with coalescing on, handling
+    a message only stores it, the diff and state writes happen on dispatch.
+    """
+    values = sorted(coordinator.dispatch_handling.values())
+    if (value := RollingWindow.percentile(values, percentile)) is None:
+        return None
+    return round(value * 1000, 2)
+
+
+def _push_age(coordinator: EcoPanelDataUpdateCoordinator) -> StateType:
+    """Seconds since the websocket last pushed data."""
+    if coordinator.last_push is None:
+        return None
+    return round(time.monotonic() - coordinator.last_push)
+
+
+def _write_latency(coordinator: EcoPanelDataUpdateCoordinator) -> StateType:
+    """99th percentile of the write response time of all devices in milliseconds."""
+    histogram = LatencyHistogram.combined(coordinator.write_latency.values())
+    if (value := histogram.percentile(99)) is None:
+        return None
+    return round(value * 1000)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EcoPanelHealthSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the integration's own health."""
+
+    value_fn: Callable[[EcoPanelDataUpdateCoordinator], StateType]
+
+
+HEALTH_SENSORS: tuple[EcoPanelHealthSensorEntityDescription, ...] = (
+    EcoPanelHealthSensorEntityDescription(
+        key="messages_per_second",
+        translation_key="messages_per_second",
+        native_unit_of_measurement="messages/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator: coordinator.message_handling.per_second(),
+    ),
+    EcoPanelHealthSensorEntityDescription(
+        key="ingest_time_median",
+        translation_key="ingest_time_median",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _ingest_time(coordinator, 50),
+    ),
+    EcoPanelHealthSensorEntityDescription(
+        key="ingest_time_p99",
+        translation_key="ingest_time_p99",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _ingest_time(coordinator, 99),
+    ),
+    EcoPanelHealthSensorEntityDescription(
+        key="last_push_age",
+        translation_key="last_push_age",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_push_age,
+    ),
+    EcoPanelHealthSensorEntityDescription(
+        key="reconnects",
+        translation_key="reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.reconnects,
+    ),
+    EcoPanelHealthSensorEntityDescription(
+        key="pending_writes",
+        translation_key="pending_writes",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.write_queue.depth,
+    ),
+    EcoPanelHealthSensorEntityDescription(
+        key="write_latency_p99",
+        translation_key="write_latency_p99",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_write_latency,
+    ),
+    EcoPanelHealthSensorEntityDescription(
+        key="entity_updates_per_second",
+        translation_key="entity_updates_per_second",
+        native_unit_of_measurement="updates/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator: coordinator.dispatch_fanout.per_second(
+            total=True
+        ),
+    ),
+)
 
 
 async def async_setup_entry(
@@ -31,289 +135,143 @@ async def async_setup_entry(
 ) -> None:
     """Set up EcoPanel sensor based on a config entry."""
     coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entity_list: list = []
 
-    # Collect from all devices the objects that can become a sensor
-    for deviceid in coordinator.data.devices:
-        if not coordinator.data.devices[deviceid].objects:
-            LOGGER.warning(f"No objects in {deviceid}!")
-            continue
+    @callback
+    def async_add_objects(objects: list[tuple[str, str]]) -> None:
+        """Add entities for objects of the types that can become a sensor."""
+        entity_list: list = []
 
-        for objectid in coordinator.data.devices[deviceid].objects:
-            if (
-                not coordinator.data.devices[deviceid]
+        for deviceid, objectid in objects:
+            if not (
+                object_identifier := coordinator.data.devices[deviceid]
                 .objects[objectid]
                 .objectIdentifier
             ):
                 LOGGER.warning(f"No object identifier for {objectid} in {deviceid}!")
                 continue
 
-            if (
-                coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
-                == "analogInput"
-            ):
+            if object_identifier[0] == "analogInput":
                 entity_list.append(
                     AnalogInputEntity(
                         coordinator=coordinator, deviceid=deviceid, objectid=objectid
                     )
                 )
-            # elif coordinator.data.devices[deviceid].objects[objectid].objectType == 'accumulator':
+            # elif object_identifier[0] == 'accumulator':
             #    entity_list.append(AnalogInputEntity(coordinator=coordinator, deviceid=deviceid, objectid=objectid))
-            # elif coordinator.data.devices[deviceid].objects[objectid].objectType == 'averaging':
+            # elif object_identifier[0] == 'averaging':
             #    entity_list.append(AveragingEntity(coordinator=coordinator, deviceid=deviceid, objectid=objectid))
-            elif (
-                coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
-                == "multiStateInput"
-            ):
+            elif object_identifier[0] == "multiStateInput":
                 entity_list.append(
                     MultiStateInputEntity(
                         coordinator=coordinator, deviceid=deviceid, objectid=objectid
                     )
                 )
 
-    async_add_entities(entity_list)
+        if entity_list:
+            async_add_entities(entity_list)
 
+    # Entities are created for the current objects, and for objects added later on
+    entry.async_on_unload(
+        coordinator.async_add_object_listener(
+            ("analogInput", "multiStateInput"), async_add_objects
+        )
+    )
 
-class AnalogInputEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], SensorEntity):
-    _attr_has_entity_name = True
+    if entry.data.get(CONF_HEALTH_SENSORS, False):
+        async_add_entities(
+            EcoPanelHealthSensor(coordinator, description)
+            for description in HEALTH_SENSORS
+        )
 
-    def __init__(
-        self,
-        coordinator: EcoPanelDataUpdateCoordinator,
-        deviceid: str,
-        objectid: str,
-    ):
-        """Initialize a BACnet AnalogInput object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
 
-    @property
-    def unique_id(self) -> str:
-        return f"{self.deviceid}_{self.objectid}"
+class AnalogInputEntity(EcoPanelEntity, SensorEntity):
+    _attr_icon = "mdi:gauge"
+    _metadata_properties = (
+        *EcoPanelEntity._metadata_properties,
+        "units",
+        "resolution",
+        "covIncrement",
+    )
 
-    @property
-    def name(self) -> str:
-        name = self.coordinator.config_entry.data.get(CONF_NAME, "object_name")
-        if name == "description":
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].description}"
-        elif name == "object_identifier":
-            identifier = (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .objectIdentifier
-            )
-            return f"{identifier[0]}:{identifier[1]}"
-        else:
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].objectName}"
+    @callback
+    def _async_update_metadata(self) -> None:
+        super()._async_update_metadata()
 
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return if the entity should be enabled when first added to the entity registry."""
-        return self.coordinator.config_entry.data.get(CONF_ENABLED, False)
+        # Decimal places to round the present value to, None for whole numbers
+        self._precision = value_precision(
+            self.bacnet_object.resolution, self.bacnet_object.covIncrement
+        )
+
+        if units := self.bacnet_object.units:
+            self._attr_native_unit_of_measurement = bacnet_to_ha_units(units)
+            self._attr_device_class = bacnet_to_device_class(units, SENSOR_DEVICE_CLASSES)
+        else:
+            self._attr_native_unit_of_measurement = None
+            self._attr_device_class = None
+
+        # isinstance, as `in` raises for other units on Python 3.11
+        if isinstance(self._attr_native_unit_of_measurement, UnitOfEnergy):
+            self._attr_state_class = "total"
+        elif isinstance(self._attr_native_unit_of_measurement, UnitOfVolume):
+            self._attr_state_class = "total"
+        else:
+            self._attr_state_class = "measurement"
 
     @property
     def native_value(self):
-        value = (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
-        
+        value = self.bacnet_object.presentValue
+
         if value is None:
             return value
 
-        if (
-            resolution := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .resolution
-        ):
-            if resolution >= 1:
-                return int(value)
-            resolution = decimal_places_needed(resolution)
-            #LOGGER.warning(f"Val {value} Res {resolution}!")
-            return round(value, resolution)
-        elif (
-            covIncrement := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .covIncrement
-        ):
-            if covIncrement >= 1:
-                return int(value)
-            covIncrement = decimal_places_needed(covIncrement)
-            return round(value, covIncrement)
-
-        return round(value, 1)
+        if self._precision is None:
+            return int(value)
 
-    @property
-    def icon(self):
-        return "mdi:gauge"
+        return round(value, self._precision)
 
-    @property
-    def device_class(self) -> str | None:
-        if (
-            units := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .units
-        ):
-            return bacnet_to_device_class(units, DEVICE_CLASS_UNITS)
-        else:
-            return None
-
-    @property
-    def native_unit_of_measurement(self) -> str | None:
-        if (
-            units := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .units
-        ):
-            return bacnet_to_ha_units(units)
-        else:
-            return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
+class MultiStateInputEntity(EcoPanelEntity, SensorEntity):
+    _attr_icon = "mdi:menu"
 
     @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
+    def native_value(self):
+        state_val = self.bacnet_object.presentValue
 
-    @property
-    def state_class(self) -> str:
-        if self.native_unit_of_measurement in UnitOfEnergy:
-            return "total"
-        elif self.native_unit_of_measurement in UnitOfVolume:
-            return "total"
+        if state_text := self.bacnet_object.stateText:
+            return state_text[state_val - STATETEXT_OFFSET]  # JCO
         else:
-            return "measurement"
+            return state_val
 
 
-class MultiStateInputEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], SensorEntity
-):
+class EcoPanelHealthSensor(SensorEntity):
+    """Sensor of the integration's own health, on a device of the interface."""
+
+    entity_description: EcoPanelHealthSensorEntityDescription
+
     _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    # Polled on SCAN_INTERVAL, so the sensors don't update with every message
+    _attr_should_poll = True
 
     def __init__(
         self,
         coordinator: EcoPanelDataUpdateCoordinator,
-        deviceid: str,
-        objectid: str,
-    ):
-        """Initialize a BACnet MultiStateInput object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
-
-    @property
-    def unique_id(self) -> str:
-        return f"{self.deviceid}_{self.objectid}"
-
-    @property
-    def name(self) -> str:
-        name = self.coordinator.config_entry.data.get(CONF_NAME, "object_name")
-        if name == "description":
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].description}"
-        elif name == "object_identifier":
-            identifier = (
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .objectIdentifier
-            )
-            return f"{identifier[0]}:{identifier[1]}"
-        else:
-            return f"{self.coordinator.data.devices[self.deviceid].objects[self.objectid].objectName}"
-
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return if the entity should be enabled when first added to the entity registry."""
-        return self.coordinator.config_entry.data.get(CONF_ENABLED, False)
-
-    @property
-    def native_value(self):
-        state_val = (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
+        description: EcoPanelHealthSensorEntityDescription,
+    ) -> None:
+        """Initialize an integration health sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry_id)},
+            name="BACnet Interface",
+            manufacturer="Bepacom",
+            model="EcoPanel BACnet/IP add-on",
+            entry_type=DeviceEntryType.SERVICE,
         )
 
-        if (
-            state_text := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .stateText
-        ):
-            return state_text[state_val - STATETEXT_OFFSET]  # JCO
-        else:
-            return state_val
-
-    @property
-    def icon(self):
-        return "mdi:menu"
-
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
+    def native_value(self) -> StateType:
+        return self.entity_description.value_fn(self.coordinator)
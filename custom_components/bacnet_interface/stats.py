@@ -0,0 +1,127 @@
+"""Statistics kept by the Bepacom EcoPanel BACnet/IP integration."""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class LatencyHistogram:
+    """Histogram of latencies with fixed buckets, so its size never grows.
+
+    Percentiles are estimated as the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        # The last bucket counts everything above the highest bound
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def combined(cls, histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+        """Return a histogram of the latencies of all histograms."""
+        total = cls()
+        for histogram in histograms:
+            total.buckets = [a + b for a, b in zip(total.buckets, histogram.buckets)]
+            total.count += histogram.count
+            total.total += histogram.total
+            total.max = max(total.max, histogram.max)
+        return total
+
+    def add(self, latency: float) -> None:
+        """Count a latency, in seconds."""
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Estimate a percentile (0-100) of the counted latencies."""
+        if not self.count:
+            return None
+
+        rank = self.count * percentile / 100
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                break
+
+        if index == len(LATENCY_BUCKETS):
+            return round(self.max, 3)
+        return round(min(LATENCY_BUCKETS[index], self.max), 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the histogram."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": round(self.max, 3),
+        }
+
+
+class RollingWindow:
+    """The latest samples of a figure, at most maxlen and at most span seconds old."""
+
+    def __init__(self, span: float = 60, maxlen: int = 1000) -> None:
+        """Initialize an empty window."""
+        self.span = span
+        self.samples: deque[tuple[float, float]] = deque(maxlen=maxlen)
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.samples.append((time.monotonic(), value))
+
+    def values(self) -> list[float]:
+        """Return the values of the samples within the span."""
+        oldest = time.monotonic() - self.span
+        return [value for sampled_at, value in self.samples if sampled_at >= oldest]
+
+    def per_second(self, values: list[float] | None = None, total: bool = False) -> float:
+        """Return the samples per second, or the sum of their values per second."""
+        if values is None:
+            values = self.values()
+        if not values:
+            return 0.0
+
+        # A full deque may cover less than the span
+        if len(values) == self.samples.maxlen:
+            span = max(time.monotonic() - self.samples[0][0], 1e-3)
+        else:
+            span = self.span
+
+        return (sum(values) if total else len(values)) / span
+
+    @staticmethod
+    def percentile(values: list[float], percentile: float) -> float | None:
+        """Return a percentile (0-100) of sorted values."""
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+    def as_dict(self, digits: int = 3) -> dict[str, Any]:
+        """Return a summary of the window, the rate is in samples per second."""
+        if not (values := self.values()):
+            return {"count": 0, "per_second": 0.0}
+
+        values.sort()
+        return {
+            "count": len(values),
+            "per_second": round(self.per_second(values), 3),
+            "mean": round(sum(values) / len(values), digits),
+            "p50": round(self.percentile(values, 50), digits),
+            "p99": round(self.percentile(values, 99), digits),
+            "max": round(values[-1], digits),
+        }
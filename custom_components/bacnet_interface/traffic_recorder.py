@@ -0,0 +1,156 @@
+"""Recorder of websocket traffic for the Bepacom EcoPanel BACnet/IP integration."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from aioecopanel import Device, DeviceDict
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import LOGGER
+from .helper import device_to_dict
+
+# Recordings are rotated at this size, the oldest of RECORDING_FILES is removed
+RECORDING_MAX_BYTES = 10 * 2**20
+RECORDING_FILES = 5
+# Recorded messages are written to disk in batches, at most this many seconds late
+RECORDING_FLUSH_INTERVAL = 5
+
+
+class Record(NamedTuple):
+    """A recorded message, with the devices it replaced or the whole tree."""
+
+    t: float
+    kind: str
+    devices: list[tuple[str, Device]]
+    resume: bool = False
+
+
+class TrafficRecorder:
+    """Writes every websocket message to gzipped JSON lines, for tools/replay.py.
+
+    A line is {"t": monotonic time, "devices": {...}} with the devices of the
+    message. Every file starts with a "tree" line with all devices instead.
+    Trees the coordinator fetched from the add-on, when setting up, polling
+    or resuming the websocket, are "tree" lines with "resume" set.
+    aioecopanel merges messages into one DeviceDict, the devices of a
+    message are those it replaced. It replaces whole Devices, so they're
+    only serialized in the executor, when they're written.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        """Initialize the recorder, nothing is written until a message comes in."""
+        self.hass = hass
+        self.path = path
+        self.recorded = 0
+
+        self._seen: dict[str, Device] = {}
+        self._records: list[Record] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._write_tree = True
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_record(self, data: DeviceDict, resume: bool = False) -> None:
+        """Record the devices a websocket message replaced, or all of a fetched tree."""
+        devices = data.devices
+
+        if self._write_tree or resume:
+            self._write_tree = False
+            self._seen = dict(devices)
+            record = Record(time.monotonic(), "tree", list(devices.items()), resume)
+        else:
+            seen = self._seen
+            replaced = [
+                (deviceid, device)
+                for deviceid, device in devices.items()
+                if seen.get(deviceid) is not device
+            ]
+            seen.update(replaced)
+            record = Record(time.monotonic(), "devices", replaced)
+
+        self._records.append(record)
+        self.recorded += 1
+
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, RECORDING_FLUSH_INTERVAL, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self, _: datetime) -> None:
+        """Write the recorded messages in the executor."""
+        self._unsub_flush = None
+        self.hass.async_create_background_task(
+            self._async_write(), "bacnet-recording-write"
+        )
+
+    async def async_close(self) -> None:
+        """Write the messages that are left."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+        await self._async_write()
+
+    async def _async_write(self) -> None:
+        """Write the recorded messages in the executor, one batch at a time."""
+        async with self._lock:
+            # Taken under the lock, so batches are written in order. The devices
+            # seen are those after the last record, a new file starts with them.
+            records, self._records = self._records, []
+
+            if records:
+                await self.hass.async_add_executor_job(
+                    self._write, records, dict(self._seen)
+                )
+
+    def _write(self, records: list[Record], tree: dict[str, Device]) -> None:
+        """Append records to the recording, a rotated one starts with the tree."""
+        lines = [self._line(record) for record in records]
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+
+            if self.path.stat().st_size < RECORDING_MAX_BYTES:
+                return
+
+            # recording to recording.1, recording.1 to recording.2 and so on
+            for index in range(RECORDING_FILES - 1, 0, -1):
+                source = self.path.with_name(
+                    f"{self.path.name}.{index - 1}" if index > 1 else self.path.name
+                )
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{index}"))
+
+            # Written with the batch, so the next file can be replayed alone
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                file.write(
+                    self._line(Record(records[-1].t, "tree", list(tree.items()))) + "\n"
+                )
+        except OSError as err:
+            LOGGER.error(f"Unable to write websocket recording {self.path}: {err}")
+
+    @staticmethod
+    def _line(record: Record) -> str:
+        """Serialize a record as JSON line."""
+        line: dict[str, Any] = {
+            "t": record.t,
+            record.kind: {
+                deviceid: device_to_dict(device) for deviceid, device in record.devices
+            },
+        }
+        if record.resume:
+            line["resume"] = True
+        return json.dumps(line)
@@ -0,0 +1,199 @@
+"""Write queue for the Bepacom EcoPanel BACnet/IP integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from aioecopanel import Interface
+from homeassistant.core import HomeAssistant, callback
+
+from .const import LOGGER
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    """A write that waits for its turn."""
+
+    # Writes with the same target are coalesced, only the newest value is written
+    target: tuple
+    value: Any
+    queued_at: float
+    future: asyncio.Future[None]
+
+
+@dataclass(slots=True)
+class WriteQueueStats:
+    """Counters of the write queue."""
+
+    writes: int = 0
+    coalesced: int = 0
+    failed: int = 0
+    max_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    depth_by_device: dict[str, int] = field(default_factory=dict)
+
+
+class WriteQueue:
+    """Writes to BACnet objects in order, with a FIFO per object.
+
+    Every object with pending writes has a single task working through its
+    FIFO, so writes to an object are never reordered. Writes in flight are
+    limited per device and for the whole site. A write that's queued behind
+    a write with the same target replaces its value instead of adding one.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interface: Interface,
+        device_limit: int,
+        site_limit: int,
+    ) -> None:
+        """Initialize the write queue."""
+        self.hass = hass
+        self.interface = interface
+        self.device_limit = device_limit
+        self.stats = WriteQueueStats()
+
+        self._queues: dict[tuple[str, str], deque[PendingWrite]] = {}
+        self._device_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._site_semaphore = asyncio.Semaphore(site_limit)
+
+    @property
+    def depth(self) -> int:
+        """Return the number of writes waiting for their turn."""
+        return sum(self.stats.depth_by_device.values())
+
+    async def async_write(
+        self,
+        deviceid: str,
+        objectid: str,
+        target: tuple,
+        value: Any = None,
+    ) -> None:
+        """Queue a write and wait until it's done.
+
+        The target is ("release",) for an empty presentValue write, or
+        ("property", propertyid, array_index, priority).
+        """
+        key = (deviceid, objectid)
+
+        if (queue := self._queues.get(key)) is None:
+            queue = self._queues[key] = deque()
+            # Not bound to the entry, so writes flushed while unloading are still sent
+            task = self.hass.async_create_background_task(
+                self._async_work(deviceid, objectid, queue),
+                f"bacnet-write-{deviceid}-{objectid}",
+            )
+            task.add_done_callback(
+                lambda task: self._async_work_done(deviceid, objectid, queue, task)
+            )
+        elif queue and queue[-1].target == target:
+            # Newest wins, the caller waits for the write that carries its value
+            queue[-1].value = value
+            self.stats.coalesced += 1
+            await asyncio.shield(queue[-1].future)
+            return
+
+        pending = PendingWrite(
+            target, value, time.monotonic(), self.hass.loop.create_future()
+        )
+        queue.append(pending)
+        self._async_count(deviceid, 1)
+
+        await asyncio.shield(pending.future)
+
+    @callback
+    def _async_count(self, deviceid: str, change: int) -> None:
+        """Keep track of the number of waiting writes"""
+        depth_by_device = self.stats.depth_by_device
+        depth_by_device[deviceid] = depth_by_device.get(deviceid, 0) + change
+        self.stats.max_depth = max(self.stats.max_depth, self.depth)
+
+    async def _async_work(
+        self, deviceid: str, objectid: str, queue: deque[PendingWrite]
+    ) -> None:
+        """Write the queued writes of an object one after another"""
+
+        if (device_semaphore := self._device_semaphores.get(deviceid)) is None:
+            device_semaphore = self._device_semaphores[deviceid] = asyncio.Semaphore(
+                self.device_limit
+            )
+
+        # Let the caller queue its write before the first one is taken
+        await asyncio.sleep(0)
+
+        pending: PendingWrite | None = None
+        try:
+            while queue:
+                # The device slot is taken first, so a busy device doesn't hold site slots
+                async with device_semaphore, self._site_semaphore:
+                    pending = queue.popleft()
+                    self._async_count(deviceid, -1)
+
+                    wait = time.monotonic() - pending.queued_at
+                    self.stats.total_wait += wait
+                    self.stats.max_wait = max(self.stats.max_wait, wait)
+                    self.stats.writes += 1
+
+                    try:
+                        await self._async_send(deviceid, objectid, pending)
+                    except Exception as err:  # pylint: disable=broad-except
+                        self.stats.failed += 1
+                        pending.future.set_exception(err)
+                    else:
+                        pending.future.set_result(None)
+        finally:
+            del self._queues[(deviceid, objectid)]
+
+            # Writes are only left when the entry unloads while writing
+            if pending and not pending.future.done():
+                pending.future.cancel()
+            for waiting in queue:
+                self._async_count(deviceid, -1)
+                waiting.future.cancel()
+
+    @callback
+    def _async_work_done(
+        self,
+        deviceid: str,
+        objectid: str,
+        queue: deque[PendingWrite],
+        task: asyncio.Task,
+    ) -> None:
+        """Clean up after a worker that was cancelled before it started."""
+
+        if not task.cancelled() or self._queues.get((deviceid, objectid)) is not queue:
+            return
+
+        del self._queues[(deviceid, objectid)]
+        for waiting in queue:
+            self._async_count(deviceid, -1)
+            waiting.future.cancel()
+        queue.clear()
+
+    async def _async_send(
+        self, deviceid: str, objectid: str, pending: PendingWrite
+    ) -> None:
+        """Send a write to the add-on"""
+
+        LOGGER.debug(f"Writing {pending.value} to {deviceid} {objectid} {pending.target}")
+
+        if pending.target[0] == "release":
+            await self.interface.write_property(deviceid=deviceid, objectid=objectid)
+            return
+
+        _, propertyid, array_index, priority = pending.target
+        await self.interface.write_property_v2(
+            deviceid=deviceid,
+            objectid=objectid,
+            propertyid=propertyid,
+            value=pending.value,
+            array_index=array_index,
+            priority=priority,
+        )
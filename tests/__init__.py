@@ -0,0 +1 @@
+"""Tests of the Bepacom EcoPanel BACnet/IP integration."""
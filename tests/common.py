@@ -0,0 +1,169 @@
+"""Fake add-on and BACnet sites for the tests."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from collections.abc import Callable
+from typing import Any
+
+from aioecopanel import (DeviceDict, EcoPanelConnectionClosed,
+                         EcoPanelConnectionError)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.bacnet_interface.const import DOMAIN
+
+
+def make_object(
+    object_type: str, instance: int, present_value: Any, **properties: Any
+) -> dict[str, Any]:
+    """Return the properties of a BACnet object as the add-on sends them."""
+    return {
+        "objectIdentifier": [object_type, instance],
+        "objectType": object_type,
+        "objectName": f"{object_type} {instance}",
+        "description": f"Test {object_type} {instance}",
+        "presentValue": present_value,
+        "statusFlags": [0, 0, 0, 0],
+        "outOfService": False,
+        "eventState": "normal",
+        "reliability": "noFaultDetected",
+        **properties,
+    }
+
+
+def make_device(instance: int) -> dict[str, Any]:
+    """Return a device with an object of every platform."""
+    deviceid = f"device:{instance}"
+    return {
+        deviceid: make_object(
+            "device",
+            instance,
+            None,
+            objectName=f"Controller {instance}",
+            vendorName="Test",
+            modelName="Test",
+        ),
+        "analogInput:1": make_object(
+            "analogInput", 1, 20.0, units="degreesCelsius", resolution=0.1
+        ),
+        "analogOutput:1": make_object(
+            "analogOutput", 1, 10.0, units="percent", resolution=0.1
+        ),
+        "analogValue:1": make_object(
+            "analogValue", 1, 50.0, units="percent", resolution=0.1
+        ),
+        "binaryValue:1": make_object("binaryValue", 1, "inactive"),
+        "multiStateValue:1": make_object(
+            "multiStateValue", 1, 1, numberOfStates=3, stateText=["Off", "Low", "High"]
+        ),
+    }
+
+
+def make_site(devices: int = 2) -> dict[str, dict[str, Any]]:
+    """Return the device tree of a site with a number of devices."""
+    return {f"device:{instance}": make_device(instance) for instance in range(devices)}
+
+
+class FakeInterface:
+    """Stands in for aioecopanel.Interface, serving the site of a test."""
+
+    def __init__(self, site: dict[str, dict[str, Any]]) -> None:
+        """Initialize the interface, the site can be changed by the test."""
+        self.site = site
+        # Requests wait while the add-on isn't responding, and fail when unreachable
+        self.responding = asyncio.Event()
+        self.responding.set()
+        self.unreachable = False
+        self.full_updates = 0
+        self.writes: list[dict[str, Any]] = []
+        self.write_delay: float = 0
+        self.listening = asyncio.Event()
+
+        self._messages: asyncio.Queue[dict | None] = asyncio.Queue()
+        self._device_dict: DeviceDict | None = None
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def update(self, full_update: bool = False) -> DeviceDict:
+        await self.responding.wait()
+        if self.unreachable:
+            raise EcoPanelConnectionError("The add-on is unreachable")
+
+        if self._device_dict is None or full_update:
+            self.full_updates += 1
+            # aioecopanel only adds devices, the add-on can forget them
+            for deviceid in DeviceDict.devices.keys() - self.site.keys():
+                del DeviceDict.devices[deviceid]
+            self._device_dict = DeviceDict(copy.deepcopy(self.site))
+
+        return self._device_dict
+
+    async def connect(self) -> None:
+        if self.unreachable:
+            raise EcoPanelConnectionError("The add-on is unreachable")
+        self._connected = True
+
+    async def disconnect(self) -> None:
+        self._connected = False
+
+    async def listen(self, callback) -> None:
+        self.listening.set()
+
+        while True:
+            message = await self._messages.get()
+            try:
+                if message is None:
+                    self.listening.clear()
+                    self._connected = False
+                    raise EcoPanelConnectionClosed("Closed by the test")
+
+                self._device_dict = DeviceDict(copy.deepcopy(message))
+                callback(self._device_dict)
+            finally:
+                self._messages.task_done()
+
+    async def push(self, message: dict[str, Any]) -> None:
+        """Push devices over the websocket, returns once they're handled."""
+        self.site.update(copy.deepcopy(message))
+        await self.listening.wait()
+        await self._messages.put(message)
+        await self._messages.join()
+
+    async def close_websocket(self) -> None:
+        """Close the websocket from the add-on's side."""
+        await self.listening.wait()
+        await self._messages.put(None)
+        await self._messages.join()
+
+    async def write_property(self, **kwargs: Any) -> None:
+        await self._async_write({**kwargs, "release": True})
+
+    async def write_property_v2(self, **kwargs: Any) -> None:
+        await self._async_write(kwargs)
+
+    async def _async_write(self, write: dict[str, Any]) -> None:
+        self.writes.append(write)
+        await asyncio.sleep(self.write_delay)
+
+
+async def async_wait_until(condition: Callable[[], bool], timeout: float = 2) -> None:
+    """Wait until a condition holds, for work done in background tasks."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+def get_entity_id(
+    hass: HomeAssistant, platform: str, deviceid: str, objectid: str
+) -> str:
+    """Return the entity_id of a BACnet object's entity."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        platform, DOMAIN, f"{deviceid}_{objectid}"
+    )
+    assert entity_id, f"No {platform} entity for {deviceid} {objectid}"
+    return entity_id
@@ -0,0 +1,114 @@
+"""Fixtures of the tests, a local Home Assistant with a fake add-on."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from aioecopanel import DeviceDict
+from homeassistant import config_entries, loader
+from homeassistant.bootstrap import async_load_base_functionality
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.storage import Store
+
+from custom_components.bacnet_interface.const import DOMAIN, STORAGE_VERSION
+from tests.common import FakeInterface, make_site
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path: Path) -> AsyncIterator[HomeAssistant]:
+    """Start a bare Home Assistant with the integration as custom component."""
+    (tmp_path / "custom_components").symlink_to(REPO_ROOT / "custom_components")
+
+    hass = HomeAssistant(str(tmp_path))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    await hass.async_start()
+
+    yield hass
+
+    await hass.async_stop(force=True)
+
+
+@pytest.fixture
+def interface() -> FakeInterface:
+    """Return the fake add-on, serving two devices."""
+    # aioecopanel keeps devices on the class, drop those of other tests
+    DeviceDict.devices.clear()
+    return FakeInterface(make_site(2))
+
+
+@pytest_asyncio.fixture
+async def setup_integration(
+    hass: HomeAssistant, interface: FakeInterface
+) -> AsyncIterator[Callable[..., Awaitable[ConfigEntry]]]:
+    """Return a function that sets up a config entry served by the fake add-on.
+
+    Keyword arguments are added to the entry's data. A snapshot is stored as
+    the last known device tree before the entry is set up.
+    """
+    entries: list[ConfigEntry] = []
+
+    async def async_setup(snapshot: dict | None = None, **data: Any) -> ConfigEntry:
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="BACnet Interface",
+            data={
+                "host": "127.0.0.1",
+                "port": 8099,
+                "enabled": True,
+                "name": "object_name",
+                "coalesce_window": 0,
+                **data,
+            },
+            source="user",
+            options={},
+        )
+
+        if snapshot is not None:
+            store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+            await store.async_save(snapshot)
+
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        entries.append(entry)
+        return entry
+
+    with patch(
+        "custom_components.bacnet_interface.coordinator.Interface",
+        return_value=interface,
+    ):
+        yield async_setup
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.fixture
+def state_writes() -> Iterator[list[str]]:
+    """Return the entity_ids of the entities that write their state from now on.
+
+    Home Assistant only fires an event when a state changes, this also counts
+    writes of an unchanged state.
+    """
+    writes: list[str] = []
+    async_write_ha_state = Entity.async_write_ha_state
+
+    def async_count_write(self: Entity) -> None:
+        writes.append(self.entity_id)
+        async_write_ha_state(self)
+
+    with patch.object(Entity, "async_write_ha_state", async_count_write):
+        yield writes
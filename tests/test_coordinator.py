@@ -0,0 +1,145 @@
+"""Tests of the coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+
+from custom_components.bacnet_interface.const import DOMAIN
+from tests.common import (FakeInterface, async_wait_until, get_entity_id,
+                          make_device, make_site)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_coalesce_window_dispatches_last_value_once(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration, state_writes
+) -> None:
+    """Messages within the coalesce window are dispatched once, with the last value."""
+    await setup_integration(coalesce_window=100)
+    entity_id = get_entity_id(hass, "sensor", "device:0", "analogInput:1")
+    state_writes.clear()
+
+    for value in (21.0, 22.0):
+        device = make_device(0)
+        device["analogInput:1"]["presentValue"] = value
+        await interface.push({"device:0": device})
+
+    assert state_writes == []
+    assert float(hass.states.get(entity_id).state) == 20.0
+
+    await asyncio.sleep(0.3)
+
+    assert state_writes == [entity_id]
+    assert float(hass.states.get(entity_id).state) == 22.0
+
+
+async def test_zero_coalesce_window_dispatches_immediately(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration, state_writes
+) -> None:
+    """Without a coalesce window every message is dispatched when it comes in."""
+    await setup_integration(coalesce_window=0)
+    entity_id = get_entity_id(hass, "sensor", "device:0", "analogInput:1")
+    state_writes.clear()
+
+    for value in (21.0, 22.0):
+        device = make_device(0)
+        device["analogInput:1"]["presentValue"] = value
+        await interface.push({"device:0": device})
+
+        assert float(hass.states.get(entity_id).state) == value
+
+    assert state_writes == [entity_id, entity_id]
+
+
+async def test_snapshot_entities_unavailable_until_addon_answers(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration
+) -> None:
+    """Entities are set up from the stored devices, and available with live data."""
+    snapshot = make_site(2)
+    interface.site["device:0"]["analogInput:1"]["presentValue"] = 25.0
+    interface.responding.clear()
+
+    entry = await setup_integration(snapshot=snapshot)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_id = get_entity_id(hass, "sensor", "device:0", "analogInput:1")
+
+    # Set up before the add-on answered, without showing the stored values
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+    interface.unreachable = True
+    interface.responding.set()
+    await async_wait_until(lambda: coordinator.last_exception is not None)
+
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+    interface.unreachable = False
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get(entity_id).state) == 25.0
+
+
+async def test_device_availability_tracked_per_device(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration
+) -> None:
+    """Only the entities of an unreachable or missing device become unavailable."""
+    await setup_integration(device_coordinators=True)
+    entity_ids = {
+        deviceid: [
+            get_entity_id(hass, "sensor", deviceid, "analogInput:1"),
+            get_entity_id(hass, "number", deviceid, "analogValue:1"),
+            get_entity_id(hass, "switch", deviceid, "binaryValue:1"),
+        ]
+        for deviceid in ("device:0", "device:1")
+    }
+
+    def available(deviceid: str) -> list[bool]:
+        return [
+            hass.states.get(entity_id).state != STATE_UNAVAILABLE
+            for entity_id in entity_ids[deviceid]
+        ]
+
+    assert available("device:0") == available("device:1") == [True] * 3
+
+    device = make_device(1)
+    device["device:1"]["reliability"] = "communicationFailure"
+    await interface.push({"device:1": device})
+
+    assert available("device:0") == [True] * 3
+    assert available("device:1") == [False] * 3
+
+    await interface.push({"device:1": make_device(1)})
+
+    assert available("device:1") == [True] * 3
+
+    # The add-on forgets the device, the tree is fetched when the websocket resumes
+    del interface.site["device:1"]
+    await interface.close_websocket()
+    await async_wait_until(interface.listening.is_set)
+
+    assert available("device:0") == [True] * 3
+    assert available("device:1") == [False] * 3
+
+
+async def test_reconnect_resumes_changes_of_the_gap(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration, state_writes
+) -> None:
+    """After a reconnect, objects that changed while disconnected are updated."""
+    await setup_integration()
+    entity_id = get_entity_id(hass, "sensor", "device:0", "analogInput:1")
+
+    await interface.close_websocket()
+    interface.site["device:0"]["analogInput:1"]["presentValue"] = 23.0
+    state_writes.clear()
+
+    await async_wait_until(interface.listening.is_set)
+    await hass.async_block_till_done()
+
+    assert state_writes == [entity_id]
+    assert float(hass.states.get(entity_id).state) == 23.0
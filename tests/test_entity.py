@@ -0,0 +1,64 @@
+"""Tests of the base entities."""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from tests.common import FakeInterface, get_entity_id, make_device
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_update_writes_only_changed_entity(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration, state_writes
+) -> None:
+    """A changed object writes the state of its own entity, and no other."""
+    await setup_integration()
+    entity_id = get_entity_id(hass, "sensor", "device:0", "analogInput:1")
+    state_writes.clear()
+
+    device = make_device(0)
+    device["analogInput:1"]["presentValue"] = 21.5
+    await interface.push({"device:0": device})
+    await hass.async_block_till_done()
+
+    assert state_writes == [entity_id]
+    assert float(hass.states.get(entity_id).state) == 21.5
+
+
+async def test_unchanged_device_writes_no_states(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration, state_writes
+) -> None:
+    """A device that's pushed again without changes doesn't write states."""
+    await setup_integration()
+    state_writes.clear()
+
+    await interface.push({"device:1": make_device(1)})
+    await hass.async_block_till_done()
+
+    assert state_writes == []
+
+
+async def test_removed_entity_stops_updating(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration, state_writes
+) -> None:
+    """An entity that's removed doesn't write its state on updates anymore."""
+    await setup_integration()
+    removed = get_entity_id(hass, "sensor", "device:0", "analogInput:1")
+    kept = get_entity_id(hass, "number", "device:0", "analogValue:1")
+
+    er.async_get(hass).async_remove(removed)
+    await hass.async_block_till_done()
+    assert hass.states.get(removed) is None
+    state_writes.clear()
+
+    device = make_device(0)
+    device["analogInput:1"]["presentValue"] = 30.0
+    device["analogValue:1"]["presentValue"] = 60.0
+    await interface.push({"device:0": device})
+    await hass.async_block_till_done()
+
+    assert hass.states.get(removed) is None
+    assert state_writes == [kept]
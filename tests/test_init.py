@@ -0,0 +1,85 @@
+"""Tests of the services of the integration."""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.bacnet_interface.const import DOMAIN
+from tests.common import FakeInterface, get_entity_id
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_write_property_to_many_entities(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration
+) -> None:
+    """Every targeted object is written, and the response has a result per entity."""
+    entry = await setup_integration(health_sensors=True)
+    targets = [
+        get_entity_id(hass, "number", "device:0", "analogValue:1"),
+        get_entity_id(hass, "number", "device:1", "analogValue:1"),
+    ]
+    health_sensor = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_pending_writes"
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "write_property",
+        {
+            "entity_id": [*targets, health_sensor],
+            "property": "presentValue",
+            "value": "42",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["status"] == "failed"
+    assert response["results"] == {
+        targets[0]: {"success": True},
+        targets[1]: {"success": True},
+        health_sensor: {"success": False, "error": "Not a BACnet object"},
+    }
+    assert sorted(
+        (write["deviceid"], write["objectid"], write["value"])
+        for write in interface.writes
+    ) == [("device:0", "analogValue:1", "42"), ("device:1", "analogValue:1", "42")]
+
+
+async def test_write_release_to_device(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration
+) -> None:
+    """Targeting a device writes to its writable objects, and only to those."""
+    await setup_integration()
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "device:0")})
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "write_release",
+        {"device_id": device.id},
+        blocking=True,
+        return_response=True,
+    )
+
+    written = {
+        get_entity_id(hass, platform, "device:0", objectid)
+        for platform, objectid in (
+            ("number", "analogOutput:1"),
+            ("number", "analogValue:1"),
+            ("switch", "binaryValue:1"),
+            ("select", "multiStateValue:1"),
+        )
+    }
+    assert response["status"] == "successfull!"
+    assert response["results"].keys() == written
+    assert sorted(write["objectid"] for write in interface.writes) == [
+        "analogOutput:1",
+        "analogValue:1",
+        "binaryValue:1",
+        "multiStateValue:1",
+    ]
+    assert all(write["release"] for write in interface.writes)
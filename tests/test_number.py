@@ -0,0 +1,84 @@
+"""Tests of the number entities."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from tests.common import FakeInterface, get_entity_id
+
+pytestmark = pytest.mark.asyncio
+
+
+async def async_set_value(hass: HomeAssistant, entity_id: str, value: float) -> None:
+    """Set the value of a number entity."""
+    await hass.services.async_call(
+        "number", "set_value", {"entity_id": entity_id, "value": value}, blocking=True
+    )
+
+
+async def test_debounce_writes_value_set_while_writing(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration
+) -> None:
+    """A value set while the previous one is written, is written after it."""
+    await setup_integration(analog_value_debounce=100)
+    entity_id = get_entity_id(hass, "number", "device:0", "analogValue:1")
+    interface.write_delay = 0.5
+
+    await async_set_value(hass, entity_id, 10.0)
+    # The debounce window has passed and the write is in flight
+    await asyncio.sleep(0.3)
+    assert [write["value"] for write in interface.writes] == [10.0]
+
+    await async_set_value(hass, entity_id, 20.0)
+    assert hass.states.get(entity_id).state == "20.0"
+    await asyncio.sleep(1)
+
+    assert [write["value"] for write in interface.writes] == [10.0, 20.0]
+    assert hass.states.get(entity_id).state == "20.0"
+
+
+async def test_debounced_value_written_on_unload(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration
+) -> None:
+    """A value still waiting for the debounce window is written when unloading."""
+    entry = await setup_integration(analog_output_debounce=60000)
+    entity_id = get_entity_id(hass, "number", "device:0", "analogOutput:1")
+
+    await async_set_value(hass, entity_id, 30.0)
+    assert hass.states.get(entity_id).state == "30.0"
+    assert interface.writes == []
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert [
+        (write["objectid"], write["value"]) for write in interface.writes
+    ] == [("analogOutput:1", 30.0)]
+
+
+async def test_number_attributes_from_metadata(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration
+) -> None:
+    """Step, limits and unit follow the object, with fallbacks per object type."""
+    interface.site["device:0"]["analogValue:1"].update(
+        minPresValue=5, maxPresValue=95, resolution=None, covIncrement=1
+    )
+    await setup_integration()
+
+    analog_value = hass.states.get(
+        get_entity_id(hass, "number", "device:0", "analogValue:1")
+    )
+    analog_output = hass.states.get(
+        get_entity_id(hass, "number", "device:0", "analogOutput:1")
+    )
+
+    assert analog_value.attributes["min"] == 5
+    assert analog_value.attributes["max"] == 95
+    assert analog_value.attributes["step"] == 1
+    assert analog_value.attributes["unit_of_measurement"] == "%"
+    assert analog_output.attributes["min"] == -2147483648
+    assert analog_output.attributes["max"] == 2147483647
+    assert analog_output.attributes["step"] == 0.1
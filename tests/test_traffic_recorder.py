@@ -0,0 +1,95 @@
+"""Tests of the websocket traffic recorder."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from aioecopanel import DeviceDict
+from homeassistant.core import HomeAssistant
+
+from custom_components.bacnet_interface.const import DOMAIN
+from custom_components.bacnet_interface.traffic_recorder import TrafficRecorder
+from tests.common import FakeInterface, make_device, make_site
+from tools.replay import read_records, recording_files
+
+pytestmark = pytest.mark.asyncio
+
+
+def present_values(devices: dict[str, dict[str, Any]]) -> dict[tuple[str, str], Any]:
+    """Return the presentValue of every object of devices."""
+    return {
+        (deviceid, objectid): bacnet_object.get("presentValue")
+        for deviceid, device in devices.items()
+        for objectid, bacnet_object in device.items()
+    }
+
+
+def replay_values(records: list[dict[str, Any]]) -> dict[tuple[str, str], Any]:
+    """Return the presentValues after replaying records, from the first tree on."""
+    assert "tree" in records[0], "The recording doesn't start with a tree"
+
+    devices: dict[str, dict[str, Any]] = {}
+    for record in records:
+        devices.update(record["devices"] if "devices" in record else record["tree"])
+    return present_values(devices)
+
+
+async def test_fetched_trees_are_recorded(
+    hass: HomeAssistant, interface: FakeInterface, setup_integration
+) -> None:
+    """A fetched tree is recorded whole, the next message only has its own device."""
+    entry = await setup_integration(record_traffic=True)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # The websocket hasn't pushed anything yet, so the poll fetches the tree
+    await coordinator.async_refresh()
+
+    device = make_device(0)
+    device["analogInput:1"]["presentValue"] = 21.0
+    await interface.push({"device:0": device})
+    await coordinator.traffic_recorder.async_close()
+
+    path = Path(hass.config.path(DOMAIN, f"recording-{entry.entry_id}.jsonl.gz"))
+    records = list(read_records([path]))
+
+    assert [("tree" in record, record.get("resume", False)) for record in records] == [
+        (True, True),
+        (True, True),
+        (False, False),
+    ]
+    assert records[-1]["devices"].keys() == {"device:0"}
+    assert replay_values(records) == present_values(interface.site)
+
+
+async def test_rotated_recording_replays_alone(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """The newest file of a rotated recording starts with the devices at that point."""
+    DeviceDict.devices.clear()
+    path = tmp_path / "recording.jsonl.gz"
+    recorder = TrafficRecorder(hass, path)
+    site = make_site(2)
+    recorder.async_record(DeviceDict(site), resume=True)
+
+    site["device:0"]["analogInput:1"]["presentValue"] = 21.0
+    recorder.async_record(DeviceDict({"device:0": site["device:0"]}))
+
+    with patch(
+        "custom_components.bacnet_interface.traffic_recorder.RECORDING_MAX_BYTES", 1
+    ):
+        writing = hass.async_create_task(recorder.async_close())
+        # The batch is taken, and written and rotated in the executor
+        await asyncio.sleep(0)
+
+        site["device:1"]["analogInput:1"]["presentValue"] = 22.0
+        recorder.async_record(DeviceDict({"device:1": site["device:1"]}))
+        await writing
+
+    await recorder.async_close()
+
+    assert len(recording_files(path)) == 2
+    assert replay_values(list(read_records([path]))) == present_values(site)
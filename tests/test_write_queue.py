@@ -0,0 +1,128 @@
+"""Tests of the write queue."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.bacnet_interface.write_queue import WriteQueue
+from tests.common import async_wait_until
+
+pytestmark = pytest.mark.asyncio
+
+PRESENT_VALUE = ("property", "presentValue", None, None)
+RELINQUISH_DEFAULT = ("property", "relinquishDefault", None, None)
+
+
+class GatedInterface:
+    """Records writes, they're in flight until the test opens the gate."""
+
+    def __init__(self) -> None:
+        """Initialize the interface with the gate closed."""
+        self.gate = asyncio.Event()
+        self.started: list[tuple[str, str, Any]] = []
+        self.written: list[tuple[str, str, Any]] = []
+        self.in_flight: dict[str, int] = {}
+        self.max_in_flight: dict[str, int] = {}
+
+    async def write_property_v2(
+        self, deviceid: str, objectid: str, propertyid: str, value: Any, **_: Any
+    ) -> None:
+        self.started.append((deviceid, objectid, value))
+        self.in_flight[deviceid] = self.in_flight.get(deviceid, 0) + 1
+        self.max_in_flight[deviceid] = max(
+            self.max_in_flight.get(deviceid, 0), self.in_flight[deviceid]
+        )
+
+        await self.gate.wait()
+
+        self.in_flight[deviceid] -= 1
+        self.written.append((deviceid, objectid, value))
+
+
+def queue_writes(
+    write_queue: WriteQueue, writes: list[tuple[str, str, tuple, Any]]
+) -> list[asyncio.Task]:
+    """Queue writes in order, as tasks that finish when they're written."""
+    return [
+        asyncio.create_task(write_queue.async_write(deviceid, objectid, target, value))
+        for deviceid, objectid, target, value in writes
+    ]
+
+
+async def test_writes_to_an_object_keep_their_order(hass: HomeAssistant) -> None:
+    """Writes to the same object are written one after another, in order."""
+    interface = GatedInterface()
+    write_queue = WriteQueue(hass, interface, device_limit=2, site_limit=10)
+
+    tasks = queue_writes(
+        write_queue,
+        [
+            ("device:0", "analogValue:1", PRESENT_VALUE, 1),
+            ("device:0", "analogValue:1", RELINQUISH_DEFAULT, 2),
+            ("device:0", "analogValue:1", PRESENT_VALUE, 3),
+            ("device:0", "analogValue:1", RELINQUISH_DEFAULT, 4),
+        ],
+    )
+    await async_wait_until(lambda: interface.started)
+    interface.gate.set()
+    await asyncio.gather(*tasks)
+
+    assert [value for _, _, value in interface.written] == [1, 2, 3, 4]
+    assert interface.max_in_flight == {"device:0": 1}
+
+
+async def test_queued_writes_to_a_target_coalesce(hass: HomeAssistant) -> None:
+    """Writes queued behind each other with the same target only write the newest."""
+    interface = GatedInterface()
+    write_queue = WriteQueue(hass, interface, device_limit=2, site_limit=10)
+
+    tasks = queue_writes(write_queue, [("device:0", "analogValue:1", PRESENT_VALUE, 1)])
+    await async_wait_until(lambda: interface.started)
+
+    # Queued while the first write is in flight
+    tasks += queue_writes(
+        write_queue,
+        [("device:0", "analogValue:1", PRESENT_VALUE, value) for value in (2, 3, 4)],
+    )
+    await asyncio.sleep(0)
+    assert write_queue.depth == 1
+
+    interface.gate.set()
+    # Every caller waits for the write that carries its value
+    await asyncio.gather(*tasks)
+
+    assert [value for _, _, value in interface.written] == [1, 4]
+    assert write_queue.stats.coalesced == 2
+    assert write_queue.depth == 0
+
+
+async def test_device_limit_is_taken_before_site_limit(hass: HomeAssistant) -> None:
+    """Writes waiting for a busy device don't keep other devices from writing."""
+    interface = GatedInterface()
+    write_queue = WriteQueue(hass, interface, device_limit=1, site_limit=2)
+
+    tasks = queue_writes(
+        write_queue,
+        [
+            ("device:0", "analogValue:1", PRESENT_VALUE, 1),
+            ("device:0", "analogValue:2", PRESENT_VALUE, 2),
+            ("device:0", "analogValue:3", PRESENT_VALUE, 3),
+            ("device:1", "analogValue:1", PRESENT_VALUE, 4),
+        ],
+    )
+    await async_wait_until(lambda: len(interface.started) == 2)
+
+    assert interface.started == [
+        ("device:0", "analogValue:1", 1),
+        ("device:1", "analogValue:1", 4),
+    ]
+
+    interface.gate.set()
+    await asyncio.gather(*tasks)
+
+    assert len(interface.written) == 4
+    assert interface.max_in_flight == {"device:0": 1, "device:1": 1}
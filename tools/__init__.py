@@ -0,0 +1 @@
+"""Development tools for the Bepacom EcoPanel BACnet/IP integration."""
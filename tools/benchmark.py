@@ -0,0 +1,248 @@
+"""Benchmark the integration on synthetic sites in a local Home Assistant instance.
+
+Run from the root of the repository, with Home Assistant and aioecopanel installed:
+
+    python -m tools.benchmark --site 10x100 --site 200x500
+
+For every site size it reports how long setting up the config entry and all
+platforms takes, what dispatching a websocket update costs, how many states
+are written per update and the peak memory. No add-on is needed, the
+integration's Interface is replaced by one that serves the synthetic site.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from aioecopanel import DeviceDict, EcoPanelConnectionClosed
+
+from tools.synthetic import change_values, make_site
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class SyntheticInterface:
+    """Stands in for aioecopanel.Interface, serving a synthetic site."""
+
+    site: dict[str, dict[str, Any]] = {}
+
+    def __init__(self, host: str, port: int, session: Any = None) -> None:
+        """Initialize the interface, every instance serves the same site."""
+        self.host = host
+        self.port = port
+        self.messages: asyncio.Queue[dict | None] = asyncio.Queue()
+        self._device_dict: DeviceDict | None = None
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def update(self, full_update: bool = False) -> DeviceDict:
+        if self._device_dict is None or full_update:
+            self._device_dict = DeviceDict(SyntheticInterface.site)
+        return self._device_dict
+
+    async def connect(self) -> None:
+        self._connected = True
+
+    async def disconnect(self) -> None:
+        self._connected = False
+
+    async def listen(self, callback) -> None:
+        while (message := await self.messages.get()) is not None:
+            self._device_dict = DeviceDict(message)
+            callback(self._device_dict)
+
+        self._connected = False
+        raise EcoPanelConnectionClosed("Benchmark finished")
+
+    async def write_property(self, **kwargs: Any) -> None:
+        pass
+
+    async def write_property_v2(self, **kwargs: Any) -> None:
+        pass
+
+
+async def async_start_hass(config_dir: str):
+    """Start a bare Home Assistant with the integration as custom component."""
+    from homeassistant import config_entries, loader
+    from homeassistant.bootstrap import async_load_base_functionality
+    from homeassistant.core import HomeAssistant
+
+    os.symlink(REPO_ROOT / "custom_components", Path(config_dir) / "custom_components")
+
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    await hass.async_start()
+    return hass
+
+
+async def async_benchmark_site(
+    devices: int, objects: int, updates: int, changed: float, seed: int
+) -> dict[str, Any]:
+    """Set up the integration for a synthetic site and push updates to it."""
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import EVENT_STATE_CHANGED
+
+    SyntheticInterface.site = make_site(devices, objects, seed)
+    # aioecopanel keeps devices on the class, drop those of the previous site
+    DeviceDict.devices.clear()
+
+    with tempfile.TemporaryDirectory() as config_dir, patch(
+        "custom_components.bacnet_interface.coordinator.Interface", SyntheticInterface
+    ):
+        hass = await async_start_hass(config_dir)
+
+        state_writes = 0
+
+        def count_state_write(_event) -> None:
+            nonlocal state_writes
+            state_writes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_write)
+
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain="bacnet_interface",
+            title="BACnet Interface",
+            data={
+                "host": "127.0.0.1",
+                "port": 8099,
+                "enabled": True,
+                "name": "object_name",
+                # Every message is dispatched on its own, so its cost can be measured
+                "coalesce_window": 0,
+            },
+            source="user",
+            options={},
+        )
+
+        started = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - started
+        entities = len(hass.states.async_entity_ids())
+
+        coordinator = hass.data["bacnet_interface"][entry.entry_id]
+        # Wait until the coordinator listens to the synthetic websocket
+        while not coordinator.interface.connected:
+            await asyncio.sleep(0.01)
+
+        rng = random.Random(seed)
+        durations: list[float] = []
+        writes: list[int] = []
+
+        for _ in range(updates):
+            message = change_values(SyntheticInterface.site, changed, rng)
+            state_writes = 0
+
+            started = time.perf_counter()
+            coordinator.interface.messages.put_nowait(message)
+            await hass.async_block_till_done()
+            durations.append(time.perf_counter() - started)
+            writes.append(state_writes)
+
+        await coordinator.interface.messages.put(None)
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+
+    return {
+        "devices": devices,
+        "objects": devices * objects,
+        "entities": entities,
+        "setup_seconds": round(setup_time, 3),
+        "update_ms_median": round(statistics.median(durations) * 1000, 3),
+        "update_ms_max": round(max(durations) * 1000, 3),
+        "state_writes_per_update": round(statistics.mean(writes), 1),
+    }
+
+
+def parse_site(value: str) -> tuple[int, int]:
+    """Parse a site size like 10x100 into devices and objects per device."""
+    devices, _, objects = value.partition("x")
+    return int(devices), int(objects)
+
+
+async def async_main(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Benchmark every site size in turn."""
+    results = []
+
+    for devices, objects in args.site or [(10, 100)]:
+        if args.tracemalloc:
+            tracemalloc.start()
+
+        result = await async_benchmark_site(
+            devices, objects, args.updates, args.changed, args.seed
+        )
+
+        if args.tracemalloc:
+            result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+            tracemalloc.stop()
+        else:
+            # Peak resident memory of the process, so far, in kilobytes on Linux
+            result["peak_rss_mb"] = round(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+            )
+
+        print(
+            f"{devices:>4} devices x {objects:>4} objects: "
+            f"setup {result['setup_seconds']:.2f} s, "
+            f"update {result['update_ms_median']:.2f} ms median "
+            f"({result['update_ms_max']:.2f} ms max), "
+            f"{result['state_writes_per_update']} states per update, "
+            f"peak {result.get('peak_mb', result.get('peak_rss_mb'))} MB"
+        )
+        results.append(result)
+
+    return results
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--site",
+        type=parse_site,
+        action="append",
+        help="site size as DEVICESxOBJECTS, can be repeated (default 10x100)",
+    )
+    parser.add_argument("--updates", type=int, default=50, help="websocket updates per site")
+    parser.add_argument(
+        "--changed", type=float, default=0.01, help="fraction of objects changed per update"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic sites")
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="report the peak of traced Python memory, slows the benchmark down",
+    )
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(async_main(args))
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
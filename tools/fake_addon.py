@@ -0,0 +1,222 @@
+"""Stand-in for the EcoPanel BACnet/IP add-on, serving a synthetic site.
+
+Run from the root of the repository, with aiohttp installed:
+
+    python -m tools.fake_addon --devices 50 --objects 200 --rate 20 --pattern bursty
+
+Then add the integration with host 127.0.0.1 and the port of the fake add-on.
+It serves the endpoints aioecopanel uses: the device tree on /apiv1/json,
+writes on /apiv1/... and /apiv2/..., and value changes on the /ws websocket.
+
+Patterns of the value changes:
+    steady  --rate messages per second, evenly spread
+    bursty  the messages of --burst-interval seconds sent at once
+    storm   steady, but every websocket is closed each --storm-interval seconds
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+from tools.synthetic import change_values, make_site
+
+LOGGER = logging.getLogger("fake_addon")
+
+PATTERNS = ("steady", "bursty", "storm")
+
+
+class FakeAddon:
+    """The state and the traffic of the fake add-on."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initialize the add-on with a synthetic site."""
+        self.args = args
+        self.site = make_site(args.devices, args.objects, args.seed)
+        self.rng = random.Random(args.seed)
+        self.websockets: set[web.WebSocketResponse] = set()
+
+        objects = sum(len(device) - 1 for device in self.site.values())
+        # Fraction of the objects that changes per message
+        self.changed = args.changes / max(objects, 1)
+
+        self.messages_sent = 0
+        self.writes = 0
+
+    def create_app(self) -> web.Application:
+        """Return the aiohttp app of the add-on."""
+        app = web.Application()
+        app.router.add_get("/apiv1/json", self.handle_json)
+        app.router.add_post("/apiv1/{deviceid}/{objectid}", self.handle_write_v1)
+        app.router.add_post(
+            "/apiv2/{deviceid}/{objectid}/{propertyid}", self.handle_write_v2
+        )
+        app.router.add_get("/ws", self.handle_websocket)
+        app.cleanup_ctx.append(self.traffic_ctx)
+        return app
+
+    async def handle_json(self, request: web.Request) -> web.Response:
+        """Return the whole device tree."""
+        return web.json_response(self.site)
+
+    async def handle_write_v1(self, request: web.Request) -> web.Response:
+        """Write the presentValue, or release it when no value is given."""
+        return await self.async_write(
+            request,
+            "presentValue",
+            request.query.get("presentValue"),
+        )
+
+    async def handle_write_v2(self, request: web.Request) -> web.Response:
+        """Write a property."""
+        return await self.async_write(
+            request,
+            request.match_info["propertyid"],
+            request.query.get("value"),
+        )
+
+    async def async_write(
+        self, request: web.Request, propertyid: str, value: str | None
+    ) -> web.Response:
+        """Write a value after the write latency, and push the device that changed."""
+        deviceid = request.match_info["deviceid"]
+        objectid = request.match_info["objectid"]
+
+        if (bacnet_object := self.site.get(deviceid, {}).get(objectid)) is None:
+            return web.json_response({"error": "unknown object"}, status=404)
+
+        latency = self.args.write_latency / 1000
+        await asyncio.sleep(self.rng.uniform(latency / 2, latency * 1.5))
+
+        if self.rng.random() < self.args.write_failure_rate:
+            return web.json_response({"error": "write failed"}, status=500)
+
+        self.writes += 1
+
+        if value is None:
+            value = bacnet_object.get("relinquishDefault", bacnet_object.get(propertyid))
+        else:
+            value = coerce(bacnet_object.get(propertyid), value)
+
+        bacnet_object[propertyid] = value
+        await self.async_push({deviceid: self.site[deviceid]})
+
+        return web.json_response({"deviceid": deviceid, "objectid": objectid, propertyid: value})
+
+    async def handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """Push value changes until the client disconnects."""
+        websocket = web.WebSocketResponse(heartbeat=30)
+        await websocket.prepare(request)
+        self.websockets.add(websocket)
+
+        try:
+            async for message in websocket:
+                if message.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self.websockets.discard(websocket)
+
+        return websocket
+
+    async def async_push(self, devices: dict[str, Any]) -> None:
+        """Send changed devices to every connected websocket."""
+        for websocket in list(self.websockets):
+            try:
+                await websocket.send_json(devices)
+            except ConnectionResetError:
+                self.websockets.discard(websocket)
+        self.messages_sent += 1
+
+    async def traffic_ctx(self, app: web.Application):
+        """Run the value changes and the report while the app runs."""
+        tasks = [
+            asyncio.create_task(self.async_traffic()),
+            asyncio.create_task(self.async_report()),
+        ]
+        yield
+        for task in tasks:
+            task.cancel()
+
+    async def async_traffic(self) -> None:
+        """Push value changes in the configured pattern."""
+        args = self.args
+        interval = 1 / args.rate if args.rate else None
+        next_storm = args.storm_interval
+
+        while interval is not None:
+            if args.pattern == "bursty":
+                await asyncio.sleep(args.burst_interval)
+                for _ in range(max(1, round(args.rate * args.burst_interval))):
+                    await self.async_push(change_values(self.site, self.changed, self.rng))
+                continue
+
+            await asyncio.sleep(interval)
+            await self.async_push(change_values(self.site, self.changed, self.rng))
+
+            if args.pattern == "storm":
+                next_storm -= interval
+                if next_storm <= 0:
+                    next_storm = args.storm_interval
+                    LOGGER.info(f"Closing {len(self.websockets)} websockets")
+                    for websocket in list(self.websockets):
+                        await websocket.close()
+
+    async def async_report(self) -> None:
+        """Log the traffic every minute."""
+        while True:
+            await asyncio.sleep(60)
+            LOGGER.info(
+                f"{len(self.websockets)} websockets, {self.messages_sent} messages, "
+                f"{self.writes} writes"
+            )
+
+
+def coerce(current: Any, value: str) -> Any:
+    """Convert a written value from the query string to the type of the property."""
+    if isinstance(current, str) and current in {"active", "inactive"}:
+        return "active" if value.lower() in {"1", "active", "true", "on"} else "inactive"
+
+    if isinstance(current, bool):
+        return value.lower() in {"1", "true", "active", "on"}
+
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+
+    return int(number) if isinstance(current, int) else number
+
+
+def main() -> None:
+    """Run the fake add-on from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--objects", type=int, default=100, help="objects per device")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic site")
+    parser.add_argument("--pattern", choices=PATTERNS, default="steady")
+    parser.add_argument("--rate", type=float, default=5, help="websocket messages per second")
+    parser.add_argument("--changes", type=int, default=5, help="objects changed per message")
+    parser.add_argument("--burst-interval", type=float, default=10, help="seconds between bursts")
+    parser.add_argument(
+        "--storm-interval", type=float, default=30, help="seconds between closing websockets"
+    )
+    parser.add_argument("--write-latency", type=float, default=50, help="mean write latency in ms")
+    parser.add_argument(
+        "--write-failure-rate", type=float, default=0, help="fraction of writes that fail"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    web.run_app(FakeAddon(args).create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
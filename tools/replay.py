@@ -0,0 +1,202 @@
+"""Replay recorded websocket traffic through the integration and measure its cost.
+
+Record traffic by switching on "Record websocket traffic" in the advanced
+customisation of the integration, the recording is written to
+<config>/bacnet_interface/recording-<entry_id>.jsonl.gz and rotated next to it.
+Replay it from the root of the repository, with Home Assistant installed:
+
+    python -m tools.replay recording-<entry_id>.jsonl.gz --speed 10
+
+Rotated files (.1, .2, ...) next to the recording are replayed first, oldest
+first. Speed 1 keeps the original timing, higher speeds are accelerated and
+speed 0 replays as fast as possible. Every message goes through the
+coordinator's websocket callback in a local Home Assistant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import statistics
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from aioecopanel import DeviceDict, EcoPanelConnectionClosed
+
+from tools.benchmark import SyntheticInterface, async_start_hass
+
+
+def recording_files(path: Path) -> list[Path]:
+    """Return the rotated files of a recording, oldest first, and the recording."""
+    rotated = sorted(
+        path.parent.glob(f"{path.name}.*"),
+        key=lambda file: int(file.suffix[1:]) if file.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    return [*rotated, path] if path.exists() else rotated
+
+
+def read_records(files: list[Path]) -> Iterator[dict[str, Any]]:
+    """Yield the records of the files in order."""
+    for file in files:
+        with gzip.open(file, "rt", encoding="utf-8") as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class ReplayInterface(SyntheticInterface):
+    """Stands in for aioecopanel.Interface, replaying recorded messages."""
+
+    records: list[dict[str, Any]] = []
+    speed: float = 1
+
+    def __init__(self, host: str, port: int, session: Any = None) -> None:
+        """Initialize the interface, its messages are the recorded ones."""
+        super().__init__(host, port, session)
+        self.ingest: list[float] = []
+        self.finished = asyncio.Event()
+
+    async def listen(self, callback) -> None:
+        if self.finished.is_set():
+            # Don't replay again after the coordinator reconnects
+            await asyncio.Event().wait()
+
+        started = time.monotonic()
+        first = self.records[0]["t"] if self.records else 0
+
+        for record in self.records:
+            if self.speed and (delay := (record["t"] - first) / self.speed - (
+                time.monotonic() - started
+            )) > 0:
+                await asyncio.sleep(delay)
+
+            ingest_started = time.perf_counter()
+            # An empty delta is a message too, it mustn't fall back to the tree
+            devices = record["devices"] if "devices" in record else record["tree"]
+            self._device_dict = DeviceDict(devices)
+            callback(self._device_dict)
+            self.ingest.append(time.perf_counter() - ingest_started)
+
+            if not self.speed:
+                # Let the coordinator's timers and tasks run between messages
+                await asyncio.sleep(0)
+
+        self.finished.set()
+        self._connected = False
+        raise EcoPanelConnectionClosed("Replay finished")
+
+
+async def async_replay(
+    records: list[dict[str, Any]], speed: float, coalesce_window: int
+) -> dict[str, Any]:
+    """Set up the integration with the first tree, and replay the other records."""
+    from homeassistant.config_entries import ConfigEntry
+
+    start = next(index for index, record in enumerate(records) if "tree" in record)
+    tree = records[start]["tree"]
+    # File start trees repeat the state, resume trees were fetched by the coordinator
+    messages = [
+        record
+        for record in records[start + 1 :]
+        if "devices" in record or record.get("resume")
+    ]
+
+    SyntheticInterface.site = tree
+    ReplayInterface.records = messages
+    ReplayInterface.speed = speed
+    DeviceDict.devices.clear()
+
+    with tempfile.TemporaryDirectory() as config_dir, patch(
+        "custom_components.bacnet_interface.coordinator.Interface", ReplayInterface
+    ):
+        hass = await async_start_hass(config_dir)
+
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain="bacnet_interface",
+            title="BACnet Interface",
+            data={
+                "host": "127.0.0.1",
+                "port": 8099,
+                "enabled": True,
+                "name": "object_name",
+                "coalesce_window": coalesce_window,
+            },
+            source="user",
+            options={},
+        )
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data["bacnet_interface"][entry.entry_id]
+        interface: ReplayInterface = coordinator.interface
+
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        await interface.finished.wait()
+        await hass.async_block_till_done()
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+
+        result = {
+            "devices": len(tree),
+            "messages": len(interface.ingest),
+            "entities": len(hass.states.async_entity_ids()),
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu, 3),
+            "messages_per_second": round(len(interface.ingest) / wall, 1) if wall else None,
+        }
+        if interface.ingest:
+            ingest = sorted(interface.ingest)
+            result.update(
+                ingest_ms_median=round(statistics.median(ingest) * 1000, 3),
+                ingest_ms_p99=round(ingest[int(len(ingest) * 0.99)] * 1000, 3),
+                ingest_ms_max=round(ingest[-1] * 1000, 3),
+            )
+        result["dispatch"] = coordinator.dispatch_handling.as_dict(digits=6)
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+
+    return result
+
+
+def main() -> None:
+    """Replay a recording from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", type=Path, help="the recording, without .1, .2, ...")
+    parser.add_argument(
+        "--speed", type=float, default=1, help="1 is the original speed, 0 as fast as possible"
+    )
+    parser.add_argument(
+        "--coalesce-window",
+        type=int,
+        default=0,
+        help="coalesce window of the coordinator in ms, 0 dispatches every message",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if not (files := recording_files(args.recording)):
+        parser.error(f"No recording at {args.recording}")
+
+    records = list(read_records(files))
+    if not any("tree" in record for record in records):
+        parser.error("The recording has no device tree to start from")
+
+    result = asyncio.run(async_replay(records, args.speed, args.coalesce_window))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
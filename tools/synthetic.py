@@ -0,0 +1,115 @@
+"""Synthetic BACnet sites in the add-on's JSON layout."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+# Share of every object type on a typical building automation site
+OBJECT_MIX: dict[str, float] = {
+    "analogInput": 0.30,
+    "analogValue": 0.15,
+    "analogOutput": 0.10,
+    "binaryInput": 0.15,
+    "binaryValue": 0.10,
+    "binaryOutput": 0.08,
+    "multiStateInput": 0.04,
+    "multiStateValue": 0.04,
+    "multiStateOutput": 0.04,
+}
+
+ANALOG_UNITS = ("degreesCelsius", "percent", "percentRelativeHumidity", "partsPerMillion", "pascals")
+
+
+def make_object(object_type: str, instance: int, rng: random.Random) -> dict[str, Any]:
+    """Return the properties of a BACnet object as the add-on sends them."""
+    bacnet_object: dict[str, Any] = {
+        "objectIdentifier": [object_type, instance],
+        "objectType": object_type,
+        "objectName": f"{object_type} {instance}",
+        "description": f"Synthetic {object_type} {instance}",
+        "statusFlags": [0, 0, 0, 0],
+        "outOfService": False,
+        "eventState": "normal",
+        "reliability": "noFaultDetected",
+    }
+
+    if object_type.startswith("analog"):
+        bacnet_object.update(
+            presentValue=round(rng.uniform(0, 100), 1),
+            units=rng.choice(ANALOG_UNITS),
+            covIncrement=0.1,
+            resolution=0.1,
+        )
+    elif object_type.startswith("binary"):
+        bacnet_object.update(presentValue=rng.choice(("active", "inactive")))
+    else:
+        bacnet_object.update(
+            presentValue=rng.randint(1, 3),
+            numberOfStates=3,
+            stateText=["Off", "Low", "High"],
+        )
+
+    return bacnet_object
+
+
+def make_device(instance: int, objects: int, rng: random.Random) -> dict[str, Any]:
+    """Return a device with a number of objects in the OBJECT_MIX."""
+    deviceid = f"device:{instance}"
+    device: dict[str, Any] = {
+        deviceid: {
+            "objectIdentifier": ["device", instance],
+            "objectType": "device",
+            "objectName": f"Controller {instance}",
+            "description": f"Synthetic controller {instance}",
+            "vendorName": "Synthetic",
+            "modelName": "Benchmark",
+            "reliability": "noFaultDetected",
+        }
+    }
+
+    object_types = rng.choices(list(OBJECT_MIX), weights=OBJECT_MIX.values(), k=objects)
+    for index, object_type in enumerate(object_types):
+        device[f"{object_type}:{index}"] = make_object(object_type, index, rng)
+
+    return device
+
+
+def make_site(devices: int, objects: int, seed: int = 0) -> dict[str, dict[str, Any]]:
+    """Return the device tree of a site, the same for the same arguments."""
+    rng = random.Random(seed)
+    return {
+        f"device:{instance}": make_device(instance, objects, rng)
+        for instance in range(devices)
+    }
+
+
+def change_values(
+    site: dict[str, dict[str, Any]], fraction: float, rng: random.Random
+) -> dict[str, dict[str, Any]]:
+    """Change the presentValue of a fraction of the objects of a site.
+
+    Returns the devices that changed, whole, like the add-on pushes them.
+    """
+    changed: dict[str, dict[str, Any]] = {}
+    keys = [
+        (deviceid, objectid)
+        for deviceid, device in site.items()
+        for objectid in device
+        if objectid != deviceid
+    ]
+
+    for deviceid, objectid in rng.sample(keys, max(1, int(len(keys) * fraction))):
+        bacnet_object = site[deviceid][objectid]
+        value = bacnet_object["presentValue"]
+
+        if isinstance(value, float):
+            bacnet_object["presentValue"] = round(value + rng.choice((-0.5, 0.5)), 1)
+        elif isinstance(value, str):
+            bacnet_object["presentValue"] = "inactive" if value == "active" else "active"
+        else:
+            bacnet_object["presentValue"] = value % bacnet_object["numberOfStates"] + 1
+
+        changed[deviceid] = site[deviceid]
+
+    return changed
@@ -0,0 +1,103 @@
+"""Benchmark translating BACnet units, old match statement against the lookup tables.
+
+Run from the root of the repository, with Home Assistant installed:
+
+    python -m tools.unit_lookup
+
+The match statement and the device class scan that BACNET_TO_HA_UNITS and
+SENSOR_DEVICE_CLASSES replaced are rebuilt from those tables, in the same
+order. The script checks that both give the same results for every unit,
+an unknown unit and None. It then times translating a mix of units to a
+unit and a sensor device class with both.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from collections.abc import Callable
+
+from homeassistant.components.sensor.const import DEVICE_CLASS_UNITS
+
+from custom_components.bacnet_interface.helper import (BACNET_TO_HA_UNITS,
+                                                       SENSOR_DEVICE_CLASSES,
+                                                       bacnet_to_device_class,
+                                                       bacnet_to_ha_units)
+
+
+def make_match() -> Callable[[str | None], str | None]:
+    """Return the unit translation as a match statement with a case per unit."""
+    units = list(BACNET_TO_HA_UNITS.values())
+    cases = "".join(
+        f"        case {unit_in!r}:\n            return units[{index}]\n"
+        for index, unit_in in enumerate(BACNET_TO_HA_UNITS)
+    )
+    source = (
+        "def bacnet_to_ha_units(unit_in):\n"
+        "    match unit_in:\n"
+        f"{cases}"
+        "        case _:\n"
+        "            return None\n"
+    )
+    namespace = {"units": units}
+    exec(compile(source, "<match>", "exec"), namespace)
+    return namespace["bacnet_to_ha_units"]
+
+
+def make_scan(
+    match: Callable[[str | None], str | None]
+) -> Callable[[str | None], str | None]:
+    """Return the device class lookup that scanned the units of every device class."""
+
+    def bacnet_to_device_class(unit_in: str | None) -> str | None:
+        if unit := match(unit_in):
+            for device_class, units in DEVICE_CLASS_UNITS.items():
+                if unit in units:
+                    return device_class
+        return None
+
+    return bacnet_to_device_class
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=100, help="units in the mix")
+    parser.add_argument("--rounds", type=int, default=2000, help="rounds per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings, the best counts")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the mix")
+    args = parser.parse_args()
+
+    match = make_match()
+    scan = make_scan(match)
+
+    for unit_in in [*BACNET_TO_HA_UNITS, "noSuchUnit", None]:
+        assert match(unit_in) == bacnet_to_ha_units(unit_in), unit_in
+        assert scan(unit_in) == bacnet_to_device_class(
+            unit_in, SENSOR_DEVICE_CLASSES
+        ), unit_in
+    print(f"Same results for all {len(BACNET_TO_HA_UNITS)} units, an unknown unit and None")
+
+    mix = random.Random(args.seed).choices(list(BACNET_TO_HA_UNITS), k=args.units)
+
+    def old() -> None:
+        for unit_in in mix:
+            match(unit_in)
+            scan(unit_in)
+
+    def new() -> None:
+        for unit_in in mix:
+            bacnet_to_ha_units(unit_in)
+            bacnet_to_device_class(unit_in, SENSOR_DEVICE_CLASSES)
+
+    lookups = args.units * args.rounds
+    old_ns = min(timeit.repeat(old, number=args.rounds, repeat=args.repeat)) / lookups * 1e9
+    new_ns = min(timeit.repeat(new, number=args.rounds, repeat=args.repeat)) / lookups * 1e9
+
+    print(f"Match and scan: {old_ns:.0f} ns per lookup")
+    print(f"Lookup tables:  {new_ns:.0f} ns per lookup, {old_ns / new_ns:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()